@@ -0,0 +1,380 @@
+import argparse
+import os
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Pure, dashboard-free computations: streamlit_dashboard.py only caches and
+# draws their results, and `python analytics.py` runs them as a batch job.
+# Anything pd.Timestamp accepts; None leaves that end of the range open
+DateLike = date | str | None
+
+# Normalised match outcomes; anything else that isn't blank still counts as a game
+OUTCOMES = ['win', 'draw', 'loss', 'other']
+
+
+def normalise_outcomes(outcome: pd.Series) -> pd.Series:
+    """
+    Lower-cased, stripped outcomes as a categorical over OUTCOMES. For a
+    categorical input only the categories are lower-cased, not every row.
+    """
+    if not isinstance(outcome.dtype, pd.CategoricalDtype):
+        outcome = outcome.astype('category')
+    labels = outcome.cat.categories.astype(str).str.strip().str.lower()
+    labels = np.where(labels.isin(OUTCOMES[:3]), labels, 'other')
+    codes = pd.Index(OUTCOMES).get_indexer(labels)
+    # -1 (missing) stays missing
+    mapped = np.where(outcome.cat.codes.to_numpy() >= 0, codes[outcome.cat.codes.to_numpy()], -1)
+    return pd.Series(pd.Categorical.from_codes(mapped, categories=OUTCOMES), index=outcome.index, name=outcome.name)
+
+
+def outcome_summary(df: pd.DataFrame, by: str | list[str], outcome_col: str = 'Outcome') -> pd.DataFrame:
+    """
+    Games / Wins / Draws / Losses / Win Rate per `by` (a column or list of
+    columns) from one grouped value_counts over the normalised outcomes.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    outcomes = normalise_outcomes(df[outcome_col])
+    counts = (
+        outcomes.groupby([df[k] for k in by], observed=True)
+        .value_counts()
+        .unstack(fill_value=0)
+        .reindex(columns=OUTCOMES, fill_value=0)
+    )
+    summary = pd.DataFrame({
+        'Games': counts.sum(axis=1),
+        'Wins': counts['win'],
+        'Draws': counts['draw'],
+        'Losses': counts['loss'],
+    })
+    summary['Win Rate'] = summary['Wins'] / summary['Games']
+    return summary.reset_index()
+
+
+# Agent to role mapping
+AGENT_ROLES = {
+    'Jett': 'Duelist', 'Raze': 'Duelist', 'Reyna': 'Duelist', 'Yoru': 'Duelist', 'Phoenix': 'Duelist', 'Iso': 'Duelist', 'Waylay': 'Duelist', 'Neon':'Duelist',
+    'Skye': 'Initiator', 'KAY/O': 'Initiator', 'Breach': 'Initiator', 'Fade': 'Initiator', 'Sova': 'Initiator', 'Gekko': 'Initiator', 'Tejo': 'Initiator',
+    'Omen': 'Controller', 'Brimstone': 'Controller', 'Astra': 'Controller', 'Viper': 'Controller', 'Harbor': 'Controller', 'Clove': 'Controller',
+    'Killjoy': 'Sentinel', 'Cypher': 'Sentinel', 'Chamber': 'Sentinel', 'Sage': 'Sentinel', 'Deadlock': 'Sentinel', 'Vyse': 'Sentinel', 'Veto': 'Sentinel'
+}
+
+# VCT average benchmarks by role
+VCT_BENCHMARKS = {
+    'Duelist':     {'ACS': 240, 'KPR': 0.90, 'FBSR': 0.55, 'FKPR': 0.18, 'Atk_Entry': 0.55},
+    'Initiator':   {'ACS': 196, 'KPR': 0.90, 'FD': 2, 'K+A per Round': 1, 'Assists': 10.0},
+    'Controller':  {'ACS': 203, 'KPR': 0.90, 'FD': 2, 'K+A per Round': 1, 'Multi_Kills': 0.25},
+    'Sentinel':    {'ACS': 200, 'KPR': 0.90, 'FD': 2, 'Multi_Kills': 0.25, 'Anchor_Time': 48.0},
+}
+
+# Radar chart normalisation (manual bounds)
+RADAR_NORM_BASE = {
+    'ACS': 300,
+    'K/D Ratio': 2.0,
+    'FK': 0.3,
+    'K+A per Round': 1.2,
+    'KPR': 1.2,
+    'FBSR': 1.0,
+    'FKPR': 0.3,
+    'Atk_Entry': 1.0,
+    'FD': 20.0,
+    'Assists': 20.0,
+    'Multi_Kills': 0.3,
+    'Anchor_Time': 80.0
+}
+
+
+def filter_rows(df: pd.DataFrame, start: DateLike = None, end: DateLike = None, map_name: str | None = "All",
+                map_col: str = 'Map', player: str | None = None) -> pd.DataFrame:
+    """
+    Rows between `start` and `end` (inclusive, whole days), on `map_name`
+    unless it is "All", and for `player` when given.
+    """
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df['Date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df['Date'] < pd.Timestamp(end) + pd.Timedelta(days=1)
+    if map_name not in (None, "All"):
+        mask &= df[map_col] == map_name
+    if player is not None:
+        mask &= df['Player'] == player
+    return df[mask]
+
+
+def map_summary(score_df: pd.DataFrame, start: DateLike, end: DateLike) -> pd.DataFrame:
+    """
+    Overview table: games / wins / draws / losses / win rate per map.
+    """
+    return outcome_summary(filter_rows(score_df, start, end), 'Map')
+
+
+def round_summary(score_rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Round Insights table per map: outcome counts plus mean attack, defence
+    and round win rates (0-1 ratios) as Raw_Atk_WR / Raw_Def_WR / Raw_Round_WR.
+    """
+    side_wr = score_rows.groupby('Map', observed=True).agg(
+        Raw_Atk_WR=('Atk WR Derived', 'mean'),
+        Raw_Def_WR=('Def WR Derived', 'mean'),
+    ).reset_index()
+    summary = outcome_summary(score_rows, 'Map').drop(columns='Win Rate').merge(side_wr, on='Map')
+    # Calculate Round Win Rate using (Atk + Def) / 2
+    summary['Raw_Round_WR'] = (summary['Raw_Atk_WR'] + summary['Raw_Def_WR']) / 2
+    return summary
+
+
+def post_plant_table(score_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mean post-plant (Atk_PP_Success) and retake (Def_PP_Success) success per
+    map, in percent.
+    """
+    return score_df.groupby('Map', observed=True).agg({
+        'Atk_PP_Success': 'mean',
+        'Def_PP_Success': 'mean'
+    }).reset_index()
+
+
+def pistol_rates(score_rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pistols won / played and pistol win rate (%) per map, best map first.
+    """
+    grouped = score_rows.assign(
+        **{'Total Pistols Won': score_rows['First Pistol'] + score_rows['Second Pistol']}
+    ).groupby('Map', observed=True).agg(
+        Total_Pistols_Won=('Total Pistols Won', 'sum'),
+        Total_Pistols_Played=('Map', 'count')
+    ).reset_index()
+
+    grouped['Total_Pistols_Played'] *= 2  # 2 pistol rounds per map
+    grouped['Pistol Win Rate (%)'] = (grouped['Total_Pistols_Won'] / grouped['Total_Pistols_Played']) * 100
+    return grouped.sort_values(by='Pistol Win Rate (%)', ascending=False)
+
+
+def second_round_conversions(score_rows: pd.DataFrame, map_name: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Share (%) of 2nd-round results on `map_name` after a pistol win (WW/WL)
+    and after a pistol loss (LL/LW), across both halves. Returns two
+    Conversion / Percentage frames, either of which may be empty.
+    """
+    conversion_data = pd.concat([
+        score_rows[['Map', 'Atk 2nd']].rename(columns={'Atk 2nd': 'Conversion'}),
+        score_rows[['Map', 'Def 2nd']].rename(columns={'Def 2nd': 'Conversion'})
+    ])
+    map_conversions = conversion_data[conversion_data['Map'] == map_name]['Conversion'].astype(str)
+
+    pies = []
+    for codes in (['WW', 'WL'], ['LL', 'LW']):
+        pie = map_conversions[map_conversions.isin(codes)].value_counts(normalize=True).reset_index()
+        pie.columns = ['Conversion', 'Percentage']
+        pie['Percentage'] *= 100
+        pies.append(pie)
+    return tuple(pies)
+
+
+def player_agent_stats(form_df: pd.DataFrame, player: str, start: DateLike, end: DateLike,
+                       map_name: str = "All") -> pd.DataFrame:
+    """
+    Player Stats table: per-agent totals, mean ACS, K/D and K+A per round
+    for `player` in the date range (and map).
+    """
+    filtered = filter_rows(form_df, start, end, map_name, map_col='Column 1', player=player)
+    agent_stats = filtered.groupby('Agent', observed=True).agg(
+        Rounds=('Rounds', 'sum'),
+        Kills=('Kills', 'sum'),
+        Deaths=('Deaths', 'sum'),
+        Assists=('Assists', 'sum'),
+        ACS=('ACS', 'mean'),
+        FK=('FK', 'sum'),
+        Plants=('Plants', 'sum')
+    ).reset_index()
+
+    agent_stats['K/D Ratio'] = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
+    agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
+    return agent_stats
+
+
+def player_role_stats(form_df: pd.DataFrame, player: str, start: DateLike, end: DateLike,
+                      map_name: str = "All") -> pd.DataFrame:
+    """
+    Player Comparison inputs: per-agent totals and per-match means of the
+    benchmark stats, tagged with the agent's role.
+    """
+    filtered = filter_rows(form_df, start, end, map_name, map_col='Column 1', player=player)
+    # Fill missing 'Atk Entry' with 0 to ensure smooth calculations
+    if 'Atk_Entry' in filtered.columns:
+        filtered = filtered.assign(Atk_Entry=filtered['Atk_Entry'].fillna(0))
+
+    agent_stats = filtered.groupby('Agent', observed=True).agg(
+        Rounds=('Rounds', 'sum'),
+        Kills=('Kills', 'sum'),
+        Deaths=('Deaths', 'sum'),
+        Multi_Kills=('Multi_Kills','mean'),
+        Assists=('Assists', 'mean'),
+        ACS=('ACS', 'mean'),
+        FK=('FK', 'sum'),
+        FBSR=('FBSR', 'mean'),
+        FKPR=('FKPR', 'mean'),
+        KPR=('KPR', 'mean'),
+        Atk_Entry=('Atk_Entry', 'mean'),
+        FD=('FD', 'mean'),
+        Anchor_Time=('Anchor_Time', 'mean')
+    ).reset_index()
+
+    agent_stats['K/D Ratio'] = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
+    agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
+    agent_stats['Role'] = agent_stats['Agent'].astype(str).map(AGENT_ROLES)
+    return agent_stats
+
+
+def radar_inputs(agent_stats: pd.DataFrame, role: str) -> tuple[list[str], dict, list[float], list[float]] | None:
+    """
+    The player's averages for `role`'s benchmark stats, and both the player
+    and the VCT benchmark normalised by RADAR_NORM_BASE for the radar chart.
+    Returns (categories, player_avg, player_values, benchmark_values), or
+    None if the player has no agents in that role.
+    """
+    role_agents = agent_stats[agent_stats['Role'] == role]
+    if role_agents.empty:
+        return None
+    benchmark = VCT_BENCHMARKS[role]
+
+    player_avg = {}
+    for stat in benchmark:
+        if stat == 'FK':
+            player_avg[stat] = (role_agents['FK'].sum() / role_agents['Rounds'].sum()) if role_agents['Rounds'].sum() > 0 else 0
+        elif stat == 'K+A per Round':
+            player_avg[stat] = (role_agents['Kills'].sum() + role_agents['Assists'].sum()) / role_agents['Rounds'].sum()
+        elif stat == 'K/D Ratio':
+            player_avg[stat] = role_agents['Kills'].sum() / role_agents['Deaths'].replace(0, float('nan')).sum()
+        else:
+            if stat in role_agents.columns:
+                val = role_agents[stat].mean()
+                player_avg[stat] = val if pd.notna(val) else 0
+            else:
+                player_avg[stat] = 0
+
+    categories = list(benchmark.keys())
+    player_values = [player_avg.get(stat, 0) / RADAR_NORM_BASE[stat] for stat in categories]
+    benchmark_values = [benchmark.get(stat, 0) / RADAR_NORM_BASE[stat] for stat in categories]
+    return categories, player_avg, player_values, benchmark_values
+
+
+def agent_win_grid(acs_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame] | None:
+    """
+    Win Rate % (1 dp), wins and games per player (rows) and agent (columns),
+    over every player and agent in the ACS view. Combinations never played
+    are NaN. None when no row has a result.
+    """
+    games_played = acs_df['Result'].notna()
+    if not games_played.any():
+        return None
+    won = (normalise_outcomes(acs_df['Result']) == 'win').astype('float64').where(games_played)
+    counts = won.groupby([acs_df['Player'], acs_df['Agent']], observed=True).agg(['sum', 'count'])
+
+    players = sorted(acs_df['Player'].dropna().unique())
+    agents = sorted(acs_df['Agent'].dropna().unique())
+    wins = counts['sum'].unstack().reindex(index=players, columns=agents)
+    games = counts['count'].unstack().reindex(index=players, columns=agents)
+    win_rate = (wins / games * 100).round(1)
+    return win_rate, wins, games
+
+
+def acs_rows(acs_df: pd.DataFrame, player: str, agents: list[str], maps: list[str],
+             start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+    """
+    ACS view rows for `player` on any of `agents` and `maps` between `start`
+    and `end` (inclusive, whole days), for the beeswarm.
+    """
+    rows = filter_rows(acs_df, start, end, player=player)
+    return rows[rows['Agent'].isin(agents) & rows['Map'].isin(maps)]
+
+
+def beeswarm_positions(rows: pd.DataFrame, category: str = 'Map', value: str = 'ACS',
+                       bins: int = 40, width: float = 0.8) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Beeswarm layout for `value` per `category`, with no collision search:
+    values are cut into `bins` bands and the points of each (category, band)
+    fan out alternately left and right of the category's centre, so it is one
+    sort and one cumcount whatever the number of points. Returns the rows
+    with a value, plus an 'x' column (category position + offset, within
+    `width`), and the categories in position order.
+    """
+    rows = rows[rows[value].notna()]
+    labels = rows[category].astype(str)
+    categories = sorted(labels.unique())
+    if rows.empty:
+        return rows.assign(x=pd.Series(dtype='float64')), categories
+
+    values = rows[value].to_numpy(dtype='float64')
+    low, span = values.min(), np.ptp(values)
+    band = np.minimum(((values - low) / (span or 1) * bins).astype('int64'), bins - 1)
+    centre = pd.Categorical(labels, categories=categories).codes
+
+    # Rank within each (category, band), lowest value first: 0, 1, 2, 3... -> 0, -1, +1, -2...
+    order = np.lexsort((values, band, centre))
+    rank = np.empty(len(rows), dtype='int64')
+    rank[order] = pd.DataFrame({'c': centre[order], 'b': band[order]}).groupby(['c', 'b']).cumcount().to_numpy()
+    step = (rank + 1) // 2 * np.where(rank % 2, -1, 1)
+
+    # Widest band fills `width`; sparse swarms keep a fixed spacing
+    spacing = min(0.04, width / 2 / max(np.abs(step).max(), 1))
+    return rows.assign(x=centre + step * spacing), categories
+
+
+def _report(path: str, compute) -> None:
+    # Each table is timed on its own, so a batch run doubles as a profile
+    started = time.perf_counter()
+    table = compute()
+    elapsed = time.perf_counter() - started
+    table.to_csv(path, index=False)
+    print(f"📁 {path}: {len(table)} rows in {elapsed * 1000:.1f} ms")
+
+
+def _all_second_round(score_rows: pd.DataFrame) -> pd.DataFrame:
+    pies = []
+    for map_name in sorted(score_rows['Map'].dropna().unique()):
+        for after, pie in zip(('win', 'loss'), second_round_conversions(score_rows, map_name)):
+            pies.append(pie.assign(Map=map_name, After_Pistol=after))
+    return pd.concat(pies, ignore_index=True) if pies else pd.DataFrame()
+
+
+def _agent_win_rates(acs_df: pd.DataFrame) -> pd.DataFrame:
+    grid = agent_win_grid(acs_df)
+    return grid[0].reset_index() if grid else pd.DataFrame()
+
+
+def main(argv: list[str] | None = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Write the dashboard's summary tables as CSVs")
+    arg_parser.add_argument('--start', default=None, help="first day (default: earliest)")
+    arg_parser.add_argument('--end', default=None, help="last day (default: latest)")
+    arg_parser.add_argument('--map', default="All", help="map for the round and player tables (default: All)")
+    arg_parser.add_argument('--player', action='append', default=None,
+                            help="player for the agent and role tables; repeatable (default: every player)")
+    arg_parser.add_argument('-o', '--output-dir', default="reports")
+    args = arg_parser.parse_args(argv)
+
+    # data_loader imports data_cleaner, which imports this module
+    from data_loader import load_acs_view, load_form, load_score
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    out = lambda name: os.path.join(args.output_dir, f"{name}.csv")
+    score_df, form_df = load_score(), load_form()
+    in_range = filter_rows(score_df, args.start, args.end)
+    on_map = filter_rows(in_range, map_name=args.map)
+
+    _report(out('map_summary'), lambda: map_summary(score_df, args.start, args.end))
+    _report(out('round_summary'), lambda: round_summary(on_map))
+    _report(out('post_plant'), lambda: post_plant_table(score_df))
+    _report(out('pistol_rates'), lambda: pistol_rates(in_range))
+    _report(out('second_round'), lambda: _all_second_round(on_map))
+    _report(out('agent_win_rates'), lambda: _agent_win_rates(load_acs_view()))
+    for player in args.player or sorted(form_df['Player'].dropna().unique()):
+        _report(out(f'agents_{player}'), lambda: player_agent_stats(form_df, player, args.start, args.end, args.map))
+        _report(out(f'roles_{player}'), lambda: player_role_stats(form_df, player, args.start, args.end, args.map))
+
+
+if __name__ == "__main__":
+    main()
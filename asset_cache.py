@@ -0,0 +1,129 @@
+import base64
+import io
+import os
+import re
+from functools import lru_cache
+
+from data_loader import file_version
+
+BACKGROUND_PATH = "wallp.png"
+LOGO_PATH = "tyloo_logo.png"
+# The background sits under an 85% black overlay, so a smaller lossy copy is indistinguishable
+BACKGROUND_MAX_WIDTH = 1280
+# Logo renders at 100px wide
+LOGO_MAX_WIDTH = 200
+
+AGENT_ICON_DIR = "assets/agents"
+# Icons are drawn at 28px; keep 2x for high-DPI screens
+AGENT_ICON_SIZE = 56
+
+
+def agent_icon_key(agent_name):
+    """
+    CSS-safe key for an agent, matching the assets/agents/<key>.png file names
+    (e.g. "KAY/O" -> "kayo").
+    """
+    return re.sub(r'[^a-z0-9]', '', str(agent_name).lower())
+
+
+@lru_cache(maxsize=None)
+def available_agent_icons():
+    if not os.path.isdir(AGENT_ICON_DIR):
+        return frozenset()
+    return frozenset(os.path.splitext(f)[0] for f in os.listdir(AGENT_ICON_DIR) if f.endswith('.png'))
+
+
+@lru_cache(maxsize=None)
+def _agent_icon_rule(key):
+    # Read, downscale and encode each icon once per process
+    from PIL import Image
+    path = os.path.join(AGENT_ICON_DIR, f"{key}.png")
+    try:
+        with Image.open(path) as img:
+            img.thumbnail((AGENT_ICON_SIZE, AGENT_ICON_SIZE))
+            buf = io.BytesIO()
+            img.save(buf, format='PNG', optimize=True)
+        data = base64.b64encode(buf.getvalue()).decode()
+    except OSError:
+        return None
+    return f'.agent-icon-{key} {{ background-image: url("data:image/png;base64,{data}"); }}'
+
+
+def agent_icon_stylesheet(agents):
+    """
+    One <style> block with a class per agent in `agents`, so each icon's data
+    URI is sent once per page no matter how many rows use it.
+    """
+    keys = sorted({agent_icon_key(a) for a in agents} & available_agent_icons())
+    rules = [rule for rule in map(_agent_icon_rule, keys) if rule]
+    return (
+        "<style>\n"
+        ".agent-icon-sprite { background-size: cover; background-position: center; }\n"
+        + "\n".join(rules)
+        + "\n</style>"
+    )
+
+
+def agent_icon_html(agent_name):
+    key = agent_icon_key(agent_name)
+    if key in available_agent_icons() and _agent_icon_rule(key):
+        return f'<div class="agent-icon-img agent-icon-sprite agent-icon-{key}" title="{agent_name}"></div>'
+    return (
+        f'<div class="agent-icon-img" style="background:#666;color:white;display:flex;align-items:center;'
+        f'justify-content:center;font-size:10px;" title="{agent_name}">{agent_name[:2]}</div>'
+    )
+
+
+def _image_format(lossy):
+    from PIL import features
+    if features.check('webp'):
+        return 'WEBP', 'image/webp'
+    return ('JPEG', 'image/jpeg') if lossy else ('PNG', 'image/png')
+
+
+@lru_cache(maxsize=16)
+def _encode_image(path, max_width, lossy, version):
+    # version (mtime, size) is only part of the cache key
+    # Pillow is only needed the first time each image is encoded
+    from PIL import Image
+    fmt, mime = _image_format(lossy)
+    with Image.open(path) as img:
+        if max_width and img.width > max_width:
+            img.thumbnail((max_width, max_width * img.height // img.width))
+        if fmt == 'JPEG':
+            img = img.convert('RGB')
+        elif img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        if lossy:
+            options = {'quality': 70}
+        else:
+            options = {'lossless': True} if fmt == 'WEBP' else {'optimize': True}
+        buf = io.BytesIO()
+        img.save(buf, format=fmt, **options)
+    return buf.getvalue(), mime
+
+
+def encoded_image(path, max_width=None, lossy=False):
+    """
+    (bytes, mime type) for `path`, downscaled to `max_width` and re-encoded
+    (WebP when Pillow supports it). Computed once per file version.
+    """
+    return _encode_image(path, max_width, lossy, file_version(path))
+
+
+def image_data_uri(path, max_width=None, lossy=False):
+    data, mime = encoded_image(path, max_width, lossy)
+    return _data_uri(data, mime)
+
+
+@lru_cache(maxsize=16)
+def _data_uri(data, mime):
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+
+def background_data_uri():
+    return image_data_uri(BACKGROUND_PATH, BACKGROUND_MAX_WIDTH, lossy=True)
+
+
+def logo_image():
+    return encoded_image(LOGO_PATH, LOGO_MAX_WIDTH)[0]
@@ -0,0 +1,72 @@
+"""
+Player ACS beeswarm on synthetic rows: seaborn's swarmplot (collision search,
+rendered to a PNG server-side) vs analytics.beeswarm_positions + a Plotly
+WebGL scatter. seaborn is no longer a dependency; without it only the
+Plotly column is timed.
+
+    python benchmarks/bench_beeswarm.py [points ...]
+"""
+import io
+import os
+import sys
+import time
+
+import plotly.express as px
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics import beeswarm_positions  # noqa: E402
+from synthetic import synthetic_form  # noqa: E402
+
+
+def acs_points(points, seed=0):
+    form = synthetic_form(points, seed)
+    return form[['Column 1', 'Agent', 'ACS', 'Date', 'Result']].rename(columns={'Column 1': 'Map'})
+
+
+def seaborn_swarm(df):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.swarmplot(data=df, x='Map', y='ACS', hue='Agent', ax=ax)
+    fig.savefig(io.BytesIO(), format='png')
+    plt.close(fig)
+
+
+def plotly_swarm(df):
+    swarm, maps = beeswarm_positions(df)
+    fig = px.scatter(swarm, x='x', y='ACS', color='Agent', render_mode='webgl')
+    fig.update_layout(xaxis=dict(tickmode='array', tickvals=list(range(len(maps))), ticktext=maps))
+    fig.to_json()
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    func(df)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    try:
+        import seaborn  # noqa: F401
+        have_seaborn = True
+    except ImportError:
+        have_seaborn = False
+
+    sizes = [int(n) for n in sys.argv[1:]] or [100, 500, 2_000]
+    # Both libraries import lazily on first use; keep that out of the timings
+    plotly_swarm(acs_points(10))
+    if have_seaborn:
+        seaborn_swarm(acs_points(10))
+    print(f"{'points':>8} {'seaborn':>10} {'plotly':>10} {'speedup':>8}")
+    for points in sizes:
+        df = acs_points(points)
+        new_time = timed(plotly_swarm, df)
+        if have_seaborn:
+            old_time = timed(seaborn_swarm, df)
+            print(f"{points:>8} {old_time * 1000:>8.1f}ms {new_time * 1000:>8.1f}ms {old_time / new_time:>7.1f}x")
+        else:
+            print(f"{points:>8} {'-':>10} {new_time * 1000:>8.1f}ms {'-':>8}")
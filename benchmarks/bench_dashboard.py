@@ -0,0 +1,217 @@
+"""
+End-to-end dashboard timings on synthetic data (benchmarks/synthetic.py):
+the dashboard's cold-start imports (benchmarks/bench_imports.py), cleaning
+the raw sheet, loading form.csv / cleaned_score.csv from CSV and
+from their Parquet stores, each section's computation and building its
+charts with the dashboard's own builders (figures.py). Every run is
+appended to a JSON history and compared with the previous run at the same
+size, so regressions show up.
+
+    python benchmarks/bench_dashboard.py [rows ...] [--repeat N] [--history PATH] [--no-record]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import analytics  # noqa: E402
+import data_loader  # noqa: E402
+import figures  # noqa: E402
+import rollups  # noqa: E402
+from compositions import CompositionIndex  # noqa: E402
+from data_cleaner import clean_scrim_form, convert_store  # noqa: E402
+from bench_imports import import_report, print_report  # noqa: E402
+from synthetic import write_dataset  # noqa: E402
+
+HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+# Slower than this many times the previous run gets flagged
+REGRESSION = 1.25
+
+
+def best_of(func, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def section_steps(form_df, score_df):
+    """
+    (name, callable) per dashboard computation, in section order, each doing
+    what the section asks analytics / rollups / compositions for.
+    """
+    acs_df = data_loader.load_acs_view()
+    score_cube = data_loader.load_rollup(data_loader.SCORE_PATH)
+    form_cube = data_loader.load_rollup(data_loader.FORM_PATH)
+    start, end = score_df['Date'].min(), score_df['Date'].max()
+    map_name = score_df['Map'].dropna().iloc[0]
+    player = form_df['Player'].dropna().iloc[0]
+    agents = sorted(acs_df['Agent'].dropna().unique())
+    maps = sorted(acs_df['Map'].dropna().unique())
+    comp_index = CompositionIndex.build(form_df, score_df)
+    role_stats = analytics.player_role_stats(form_df, player, start, end)
+    return [
+        ('overview.map_summary', lambda: analytics.map_summary(score_df, start, end)),
+        ('overview.map_summary_rollup', lambda: rollups.map_summary(score_cube, start, end)),
+        ('compositions.index_build', lambda: CompositionIndex.build(form_df, score_df)),
+        ('compositions.table', lambda: comp_index.table(map_name)),
+        ('compositions.heatmap_grid', lambda: analytics.agent_win_grid(acs_df)),
+        ('round_insights.round_summary', lambda: analytics.round_summary(analytics.filter_rows(score_df, start, end))),
+        ('round_insights.round_summary_rollup', lambda: rollups.round_summary(score_cube, start, end)),
+        ('round_insights.post_plant', lambda: analytics.post_plant_table(score_df)),
+        ('pistol.pistol_rates', lambda: analytics.pistol_rates(analytics.filter_rows(score_df, start, end))),
+        ('pistol.second_round', lambda: analytics.second_round_conversions(score_df, map_name)),
+        ('player_stats.agent_stats', lambda: analytics.player_agent_stats(form_df, player, start, end)),
+        ('player_stats.agent_stats_rollup', lambda: rollups.player_agent_stats(form_cube, player, start, end)),
+        ('player_stats.beeswarm_rows', lambda: analytics.acs_rows(acs_df, player, agents, maps, start, end)),
+        ('comparison.role_stats', lambda: analytics.player_role_stats(form_df, player, start, end)),
+        ('comparison.radar_inputs', lambda: analytics.radar_inputs(role_stats, 'Duelist')),
+    ]
+
+
+def figure_steps(form_df, score_df):
+    """
+    (name, callable) per dashboard chart, calling the same figures.py builders
+    as the dashboard on precomputed tables, so only figure construction is
+    timed. Names match the dashboard's figure.* timers.
+    """
+    start, end = score_df['Date'].min(), score_df['Date'].max()
+    map_name = score_df['Map'].dropna().iloc[0]
+    summary = analytics.map_summary(score_df, start, end)
+    rounds = analytics.round_summary(score_df)
+    post_plant = analytics.post_plant_table(score_df)
+    pistols = analytics.pistol_rates(score_df)
+    pie_win, pie_loss = analytics.second_round_conversions(score_df, map_name)
+    compositions = CompositionIndex.build(form_df, score_df).table(map_name)
+    acs_df = data_loader.load_acs_view()
+    grid = analytics.agent_win_grid(acs_df)
+    player = form_df['Player'].dropna().iloc[0]
+    radar = analytics.radar_inputs(analytics.player_role_stats(form_df, player, start, end), 'Duelist')
+    agents, maps = sorted(acs_df['Agent'].dropna().unique()), sorted(acs_df['Map'].dropna().unique())
+    beeswarm_rows = analytics.acs_rows(acs_df, player, agents, maps, start, end).astype(
+        {'Player': str, 'Agent': str, 'Map': str})
+    return [
+        ('figure.map_win_rates', lambda: figures.map_win_rates(summary)),
+        ('figure.composition_html', lambda: figures.composition_html(compositions)),
+        ('figure.agent_heatmap', lambda: figures.agent_heatmap(*grid)),
+        ('figure.side_win_rates', lambda: figures.side_win_rates(rounds)),
+        ('figure.post_plant', lambda: figures.post_plant(post_plant, 'Atk_PP_Success')),
+        ('figure.pistol_rates', lambda: figures.pistol_rates(pistols)),
+        ('figure.conversion_pie', lambda: figures.conversion_pie(pie_win, map_name)),
+        ('figure.eco_pie', lambda: figures.eco_pie(pie_loss, map_name)),
+        ('figure.beeswarm', lambda: figures.beeswarm(beeswarm_rows, player)),
+        ('figure.radar', lambda: figures.radar(radar, player, 'Duelist')),
+    ]
+
+
+def run_size(rows, repeat):
+    """
+    Timings (seconds, best of `repeat`) for one synthetic dataset of `rows`
+    form.csv player rows.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        write_dataset(directory, rows)
+        cwd = os.getcwd()
+        # data_loader / data_cleaner paths are relative to the working directory
+        os.chdir(directory)
+        try:
+            data_loader.clear_cache()
+            results['clean_scrim_form'] = best_of(lambda: clean_scrim_form('score.csv'), repeat)
+            load = lambda: (data_loader.load_form(), data_loader.load_score())
+            results['load.csv'] = best_of(load, repeat, setup=data_loader.clear_cache)
+            results['convert_store'] = best_of(
+                lambda: [convert_store(path) for path in (data_loader.FORM_PATH, data_loader.SCORE_PATH)], 1)
+            results['load.parquet'] = best_of(load, repeat, setup=data_loader.clear_cache)
+
+            form_df, score_df = load()
+            for name, step in section_steps(form_df, score_df) + figure_steps(form_df, score_df):
+                results[name] = best_of(step, repeat)
+        finally:
+            os.chdir(cwd)
+            data_loader.clear_cache()
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def previous_results(history, rows):
+    for run in reversed(history):
+        if str(rows) in run['results']:
+            return run['results'][str(rows)]
+    return {}
+
+
+def report(rows, results, previous):
+    print(f"\n{rows:,} player rows")
+    print(f"{'step':<40} {'ms':>10} {'vs last':>9}")
+    for name, seconds in results.items():
+        change = ""
+        if name in previous and previous[name] > 0:
+            ratio = seconds / previous[name]
+            change = f"{ratio:.2f}x" + (" ⚠️" if ratio > REGRESSION else "")
+        print(f"{name:<40} {seconds * 1000:>10.2f} {change:>9}")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Time the dashboard pipeline on synthetic scrim data")
+    arg_parser.add_argument('sizes', nargs='*', type=int, help="form.csv player rows (default: 1000 10000 100000)")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="runs per step; the best is kept")
+    arg_parser.add_argument('--history', default=HISTORY)
+    arg_parser.add_argument('--no-record', action='store_true', help="compare with the history but don't add to it")
+    args = arg_parser.parse_args(argv)
+
+    history = load_history(args.history)
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'repeat': args.repeat,
+        'startup': import_report(runs=args.repeat),
+        'results': {},
+    }
+    print_report(run['startup'])
+    previous_startup = next((old['startup'] for old in reversed(history) if 'startup' in old), None)
+    if previous_startup:
+        print(f"  vs last run: {sum(run['startup'].values()) / sum(previous_startup.values()):.2f}x")
+    for rows in args.sizes or [1_000, 10_000, 100_000]:
+        results = run_size(rows, args.repeat)
+        report(rows, results, previous_results(history, rows))
+        run['results'][str(rows)] = results
+
+    if not args.no_record:
+        history.append(run)
+        with open(args.history, 'w') as f:
+            json.dump(history, f, indent=1)
+        print(f"\n📁 Recorded in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Cold-start import cost of the dashboard: runs streamlit_dashboard.py's
+top-level imports in a fresh interpreter under `python -X importtime` and
+reports the total and the slowest top-level packages (median of several
+runs). --against REV measures a git revision of the repo the same way, for
+a before / after comparison.
+
+    python benchmarks/bench_imports.py [--runs N] [--top N] [--against REV]
+"""
+import argparse
+import ast
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = "streamlit_dashboard.py"
+# "import time: <self us> | <cumulative us> | <indent><module>"
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def dashboard_imports(root):
+    """
+    The import statements at the top level of the dashboard script, as code.
+    """
+    with open(os.path.join(root, DASHBOARD)) as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def _importtime(code, root):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=root,
+                            capture_output=True, text=True, check=True)
+    # Top-level imports only (no indent); nested ones are inside their cumulative time
+    return {
+        match.group(4): int(match.group(2)) / 1e6
+        for match in map(_LINE.match, result.stderr.splitlines())
+        if match and not match.group(3)
+    }
+
+
+def import_report(root=ROOT, runs=5):
+    """
+    {top-level module: median seconds} for the dashboard's imports, leaving
+    out what the bare interpreter already imports at startup.
+    """
+    code = dashboard_imports(root)
+    baseline = set(_importtime("pass", root))
+    samples = defaultdict(list)
+    for _ in range(runs):
+        for module, seconds in _importtime(code, root).items():
+            if module not in baseline:
+                samples[module].append(seconds)
+    return {module: statistics.median(times) for module, times in samples.items()}
+
+
+def print_report(report, top=10, label="dashboard imports"):
+    print(f"{label}: {sum(report.values()) * 1000:.0f} ms")
+    for module, seconds in sorted(report.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {module:<32} {seconds * 1000:>8.1f} ms")
+
+
+def _checkout(rev, directory):
+    # git archive of `rev` unpacked into `directory`, data files included
+    archive = os.path.join(directory, "rev.tar")
+    subprocess.run(["git", "archive", "-o", archive, rev], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(directory, filter='data')
+    return directory
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Time the dashboard's top-level imports")
+    arg_parser.add_argument('--runs', type=int, default=5, help="interpreter runs; the median is kept")
+    arg_parser.add_argument('--top', type=int, default=10, help="slowest top-level modules to list")
+    arg_parser.add_argument('--against', metavar='REV', help="also measure this git revision")
+    args = arg_parser.parse_args(argv)
+
+    after = import_report(ROOT, args.runs)
+    if args.against:
+        with tempfile.TemporaryDirectory() as directory:
+            before = import_report(_checkout(args.against, directory), args.runs)
+        print_report(before, args.top, f"{args.against}")
+        print()
+    print_report(after, args.top, "working tree")
+    if args.against:
+        print(f"\nchange: {(sum(after.values()) - sum(before.values())) * 1000:+.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Outcome counting on synthetic cleaned_score data: the per-group lambdas the
+Overview / Round Insights tabs used vs analytics.outcome_summary.
+
+    python benchmarks/bench_outcomes.py [rows ...]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics import outcome_summary  # noqa: E402
+from synthetic import synthetic_score  # noqa: E402
+
+
+def synthetic_outcomes(rows, seed=0):
+    # Map / Outcome as the typed store holds them
+    return synthetic_score(rows, seed)[['Map', 'Outcome']].astype('category')
+
+
+def lambda_summary(df):
+    summary = df.groupby('Map', observed=True).agg(
+        Games=('Outcome', 'count'),
+        Wins=('Outcome', lambda x: (x.str.lower() == 'win').sum()),
+        Draws=('Outcome', lambda x: (x.str.lower() == 'draw').sum()),
+        Losses=('Outcome', lambda x: (x.str.lower() == 'loss').sum())
+    ).reset_index()
+    summary['Win Rate'] = summary['Wins'] / summary['Games']
+    return summary
+
+
+def best_of(func, df, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000, 100_000, 1_000_000]
+    print(f"{'rows':>10} {'lambdas':>10} {'helper':>10} {'speedup':>8}")
+    for rows in sizes:
+        df = synthetic_outcomes(rows)
+        old_time, old = best_of(lambda_summary, df)
+        new_time, new = best_of(lambda d: outcome_summary(d, 'Map'), df)
+        pd.testing.assert_frame_equal(old, new, check_dtype=False, check_categorical=False)
+        print(f"{rows:>10} {old_time * 1000:>8.1f}ms {new_time * 1000:>8.1f}ms {old_time / new_time:>7.1f}x")
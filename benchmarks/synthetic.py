@@ -0,0 +1,164 @@
+"""
+Synthetic scrim data shaped like the real files, for benchmarks: form.csv
+player rows, the cleaned_score.csv they were played in, and the raw score.csv
+sheet (date header rows + match rows) that data_cleaner turns into it.
+
+    python benchmarks/synthetic.py ROWS [DIR]
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics import AGENT_ROLES  # noqa: E402
+
+MAPS = ['Abyss', 'Ascent', 'Bind', 'Corrode', 'Haven', 'Icebox', 'Lotus', 'Pearl', 'Split', 'Sunset']
+# One per assets/agents icon
+AGENTS = sorted(AGENT_ROLES)
+PLAYERS = ['Erv', 'flow', 'scales', 'splash', 'xihe', 'sub1', 'sub2']
+TEAMS = ['Secret', 'Paper Rex', 'Rex Regum', 'Talon', 'Boom', 'DRX', 'Gen.G', 'T1']
+RESULTS = ['Win', 'Loss', 'Draw']
+TEAM_SIZE = 5
+MATCHES_PER_DAY = 6
+
+FORM_COLUMNS = [
+    'Column 1', 'Player', 'Rounds', 'Kills', 'Deaths', 'Assists', 'ACS', 'Agent', 'FK', 'Plants', 'Defuses',
+    'FD', 'FK+FD', 'FBSR', 'FKPR', 'KPR', 'Date', 'K+A PR', 'Atk_Entry', 'Multi_Kills', 'Anchor_Time', 'Result',
+]
+
+
+def _matches(n, rng):
+    # Shared by both files so compositions find their (map, outcome) in the scores
+    days = pd.Timestamp('2025-01-01') + pd.to_timedelta(np.arange(n) // MATCHES_PER_DAY, unit='D')
+    return pd.DataFrame({
+        'Date': days,
+        'Map': rng.choice(MAPS, n),
+        'Result': rng.choice(RESULTS, n, p=[.5, .42, .08]),
+    })
+
+
+def synthetic_form(rows, seed=0):
+    """
+    `rows` form.csv player rows as read from the CSV: five per match, five
+    different players on five different agents, dates as MM/DD/YYYY.
+    """
+    rng = np.random.default_rng(seed)
+    matches = _matches(-(-rows // TEAM_SIZE), rng)
+    slot = np.repeat(np.arange(len(matches)), TEAM_SIZE)[:rows]
+
+    # Five distinct agents / players per match: argsort of random keys
+    agents = np.argsort(rng.random((len(matches), len(AGENTS))), axis=1)[:, :TEAM_SIZE].ravel()[:rows]
+    players = np.argsort(rng.random((len(matches), len(PLAYERS))), axis=1)[:, :TEAM_SIZE].ravel()[:rows]
+
+    rounds = rng.integers(13, 27, rows)
+    kills = rng.poisson(rounds * 0.72)
+    deaths = rng.poisson(rounds * 0.7)
+    assists = rng.poisson(rounds * 0.3)
+    fk = rng.binomial(rounds, 0.11)
+    fd = rng.binomial(rounds, 0.1)
+    atk_entry = rng.random(rows).round(2)
+    return pd.DataFrame({
+        'Column 1': matches['Map'].to_numpy()[slot],
+        'Player': np.asarray(PLAYERS)[players],
+        'Rounds': rounds,
+        'Kills': kills,
+        'Deaths': deaths,
+        'Assists': assists,
+        'ACS': rng.normal(205, 55, rows).clip(40, 450).round(),
+        'Agent': np.asarray(AGENTS)[agents],
+        'FK': fk,
+        'Plants': rng.poisson(1.5, rows),
+        'Defuses': rng.poisson(0.4, rows),
+        'FD': fd,
+        'FK+FD': fk + fd,
+        'FBSR': rng.random(rows).round(2),
+        'FKPR': (fk / rounds).round(2),
+        'KPR': (kills / rounds).round(2),
+        'Date': matches['Date'].dt.strftime('%m/%d/%Y').to_numpy()[slot],
+        'K+A PR': ((kills + assists) / rounds).round(2),
+        # Only filled in on some sheets
+        'Atk_Entry': np.where(rng.random(rows) < 0.4, atk_entry, np.nan),
+        'Multi_Kills': np.where(rng.random(rows) < 0.4, (rng.random(rows) * 0.4).round(2), np.nan),
+        'Anchor_Time': np.where(rng.random(rows) < 0.4, rng.normal(45, 12, rows).clip(1, None).round(1), np.nan),
+        'Result': matches['Result'].to_numpy()[slot],
+    }, columns=FORM_COLUMNS)
+
+
+def synthetic_score(matches, seed=0):
+    """
+    `matches` cleaned_score.csv rows (dates as YYYY/M/D, post-plant as "42.86%"),
+    for the same matches synthetic_form(matches * 5, seed) played.
+    """
+    rng = np.random.default_rng(seed)
+    played = _matches(matches, rng)
+    first_pistol = rng.integers(0, 2, matches)
+    second_pistol = rng.integers(0, 2, matches)
+    first_rounds = rng.integers(2, 11, matches)
+    second_rounds = rng.integers(2, 11, matches)
+
+    def second_round(pistol):
+        return np.where(pistol == 1, rng.choice(['WW', 'WL'], matches, p=[.7, .3]),
+                        rng.choice(['LL', 'LW'], matches, p=[.75, .25]))
+
+    return pd.DataFrame({
+        'Date': [f"{d.year}/{d.month}/{d.day}" for d in played['Date']],
+        'ZETA': rng.choice(TEAMS, matches),
+        'Map': played['Map'],
+        'Start': rng.choice(['Attack', 'Defence'], matches),
+        'First Pistol': first_pistol,
+        'First Rounds': first_rounds,
+        'First Half WR': (first_rounds / 12).round(2),
+        'Second Pistol': second_pistol,
+        'Second Rounds': second_rounds,
+        'Second Half WR': (second_rounds / 12).round(2),
+        'Atk_PP_Success': [f"{v:.2f}%" for v in rng.uniform(30, 90, matches)],
+        'Def_PP_Success': [f"{v:.2f}%" for v in rng.uniform(10, 60, matches)],
+        'Atk 2nd': second_round(first_pistol),
+        'Def 2nd': second_round(second_pistol),
+        'Outcome': played['Result'],
+    })
+
+
+def score_sheet(score_df):
+    """
+    The raw tracking sheet `score_df` was cleaned from: a header row, then
+    per day a date label row followed by that day's matches (no Date column).
+    """
+    body = score_df.drop(columns='Date')
+    labels = pd.to_datetime(score_df['Date'], format='%Y/%m/%d').dt.strftime('%B %d %Y')
+    header = ','.join(body.columns)
+    separator = ',' * (body.shape[1] - 1)
+    rows = body.to_csv(header=False, index=False).splitlines()
+    lines = [header]
+    previous = None
+    for label, row in zip(labels, rows):
+        if label != previous:
+            lines.append(label + separator)
+            previous = label
+        lines.append(row)
+    return '\n'.join(lines) + '\n'
+
+
+def write_dataset(directory, rows, seed=0):
+    """
+    Writes form.csv (`rows` player rows), cleaned_score.csv and score.csv for
+    the same matches into `directory` and returns their paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    form = synthetic_form(rows, seed)
+    score = synthetic_score(-(-rows // TEAM_SIZE), seed)
+    paths = {name: os.path.join(directory, name) for name in ('form.csv', 'cleaned_score.csv', 'score.csv')}
+    form.to_csv(paths['form.csv'], index=False)
+    score.to_csv(paths['cleaned_score.csv'], index=False)
+    with open(paths['score.csv'], 'w') as f:
+        f.write(score_sheet(score))
+    return paths
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    directory = sys.argv[2] if len(sys.argv) > 2 else f"synthetic_{rows}"
+    for path in write_dataset(directory, rows).values():
+        print(f"📁 {path}")
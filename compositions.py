@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+TEAM_SIZE = 5
+
+
+def extract_compositions(form_df):
+    """
+    Splits form.csv player rows into consecutive 5-player match blocks and
+    returns one row per block whose map and result agree across all five
+    players, with the agents as a sorted tuple.
+    Columns: Match, Map, Result, Composition (+ Date when form_df has one)
+    """
+    rows = composition_rows(form_df)
+    n_full = len(rows) // TEAM_SIZE * TEAM_SIZE
+    if n_full == 0:
+        return pd.DataFrame(columns=['Match', 'Map', 'Result', 'Composition'])
+
+    # One row per match block, one column per player slot
+    maps = rows['Column 1'].to_numpy()[:n_full].reshape(-1, TEAM_SIZE)
+    results = rows['Result'].to_numpy()[:n_full].reshape(-1, TEAM_SIZE)
+    agents = np.sort(rows['Agent'].to_numpy()[:n_full].astype(str).reshape(-1, TEAM_SIZE), axis=1)
+
+    valid = (maps == maps[:, :1]).all(axis=1) & (results == results[:, :1]).all(axis=1)
+    comps = pd.DataFrame({
+        'Match': np.flatnonzero(valid),
+        'Map': maps[valid, 0],
+        'Result': results[valid, 0],
+        'Composition': list(map(tuple, agents[valid].tolist())),
+    })
+    if 'Date' in rows.columns:
+        comps['Date'] = rows['Date'].to_numpy()[:n_full:TEAM_SIZE][valid]
+    return comps
+
+
+def composition_rows(form_df):
+    """
+    The player rows composition blocks are cut from: rows missing a map,
+    agent or result are dropped before grouping into fives.
+    """
+    cols = ['Column 1', 'Agent', 'Result'] + (['Date'] if 'Date' in form_df.columns else [])
+    return form_df[cols].dropna(subset=['Column 1', 'Agent', 'Result'])
+
+
+class CompositionIndex:
+    """
+    Persistent map -> composition -> result counts, with per-date buckets for
+    date-range queries. Built once per data version; when scrim rows are
+    appended to form.csv a copy is extended with just the new blocks instead
+    of being rebuilt.
+    """
+
+    def __init__(self):
+        self._counts = {}    # map -> {composition: {result: n}}
+        self._by_date = {}   # map -> {composition: {date: {result: n}}}
+        self._scored = set()  # (map, result) pairs present in cleaned_score.csv
+        self.rows_seen = 0   # composition rows already consumed (whole blocks only)
+        self._row_hashes = np.empty(0, dtype=np.uint64)  # one per consumed row
+
+    @classmethod
+    def build(cls, form_df, score_df):
+        index = cls()
+        index.set_scores(score_df)
+        index.extend(form_df)
+        return index
+
+    def set_scores(self, score_df):
+        if score_df.empty:
+            self._scored = set()
+            return
+        self._scored = set(zip(score_df['Map'], score_df['Outcome'].astype(str).str.lower()))
+
+    def copy(self):
+        index = CompositionIndex()
+        index._counts = {m: {c: dict(n) for c, n in comps.items()} for m, comps in self._counts.items()}
+        index._by_date = {
+            m: {c: {day: dict(n) for day, n in dates.items()} for c, dates in comps.items()}
+            for m, comps in self._by_date.items()
+        }
+        index._scored = set(self._scored)
+        index.rows_seen = self.rows_seen
+        index._row_hashes = self._row_hashes
+        return index
+
+    def is_continuation_of(self, rows):
+        """
+        True if `rows` starts with every row already indexed, unchanged, i.e.
+        new rows were only appended.
+        """
+        if len(rows) < self.rows_seen:
+            return False
+        return np.array_equal(_row_hashes(rows.iloc[:self.rows_seen]), self._row_hashes)
+
+    def extend(self, form_df):
+        """
+        Indexes the complete blocks of `form_df` past `rows_seen`.
+        """
+        rows = composition_rows(form_df)
+        n_full = len(rows) // TEAM_SIZE * TEAM_SIZE
+        if n_full <= self.rows_seen:
+            return 0
+        new_comps = extract_compositions(rows.iloc[self.rows_seen:n_full])
+        for record in new_comps.itertuples(index=False):
+            result = str(record.Result).lower()
+            comps = self._counts.setdefault(record.Map, {})
+            counts = comps.setdefault(record.Composition, {})
+            counts[result] = counts.get(result, 0) + 1
+            if 'Date' in new_comps.columns and pd.notna(record.Date):
+                dates = self._by_date.setdefault(record.Map, {}).setdefault(record.Composition, {})
+                day = dates.setdefault(pd.Timestamp(record.Date).normalize(), {})
+                day[result] = day.get(result, 0) + 1
+        self._row_hashes = np.concatenate([self._row_hashes, _row_hashes(rows.iloc[self.rows_seen:n_full])])
+        self.rows_seen = n_full
+        return len(new_comps)
+
+    def maps(self):
+        return sorted(self._counts)
+
+    def table(self, map_name, start=None, end=None, top=15):
+        """
+        Games / wins / draws / losses and win rate per composition on one
+        map, best first, counting only results that also appear in
+        cleaned_score.csv. `start`/`end` restrict
+        the count to the per-date buckets in that range.
+        """
+        records = []
+        if start is None and end is None:
+            per_comp = self._counts.get(map_name, {}).items()
+        else:
+            start = pd.Timestamp.min if start is None else pd.Timestamp(start)
+            end = pd.Timestamp.max if end is None else pd.Timestamp(end)
+            per_comp = []
+            for comp, dates in self._by_date.get(map_name, {}).items():
+                counts = {}
+                for day, day_counts in dates.items():
+                    if start <= day <= end:
+                        for result, n in day_counts.items():
+                            counts[result] = counts.get(result, 0) + n
+                per_comp.append((comp, counts))
+
+        for comp, counts in per_comp:
+            counts = {r: n for r, n in counts.items() if (map_name, r) in self._scored}
+            games = sum(counts.values())
+            if games:
+                records.append({
+                    'Composition': comp,
+                    'games': games,
+                    'wins': counts.get('win', 0),
+                    'draws': counts.get('draw', 0),
+                    'losses': counts.get('loss', 0),
+                })
+        if not records:
+            return pd.DataFrame()
+        grouped = pd.DataFrame(records)
+        grouped['Win Rate %'] = grouped['wins'] / grouped['games'] * 100
+        grouped['Comp String'] = grouped['Composition'].map('-'.join)
+        return grouped.sort_values(by='Win Rate %', ascending=False).head(top)
+
+
+def _row_hashes(rows):
+    return pd.util.hash_pandas_object(rows.astype(str), index=False).to_numpy()
+
+
+_shared_index = {}
+
+
+def shared_composition_index(form_df, score_df, form_version, score_version):
+    """
+    Process-wide CompositionIndex for the current data version. Appended
+    form rows extend a copy of the existing index; any other change rebuilds
+    it. The shared index is never modified, only replaced in one assignment,
+    so other sessions can keep reading the one they were handed.
+    """
+    global _shared_index
+    shared = _shared_index
+    index = shared.get('index')
+    if (index is not None and shared['form_version'] == form_version
+            and shared['score_version'] == score_version):
+        return index
+
+    if index is None or not index.is_continuation_of(composition_rows(form_df)):
+        index = CompositionIndex.build(form_df, score_df)
+    else:
+        index = index.copy()
+        if shared['score_version'] != score_version:
+            index.set_scores(score_df)
+        index.extend(form_df)
+    _shared_index = {'index': index, 'form_version': form_version, 'score_version': score_version}
+    return index
@@ -1,53 +1,665 @@
+import argparse
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from dateutil import parser
 
-def clean_scrim_form(path):
+from analytics import AGENT_ROLES
+from rollups import append_rollup, write_rollup
+from sql_backend import append_table, write_table
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10_000
+SHEET_EXTENSIONS = ('.csv', '.xlsx')
+# Per-file cleaned results and the content hashes they were built from
+CACHE_DIR = ".clean_cache"
+STATE_FILE = os.path.join(CACHE_DIR, "state.json")
+# Per-output append watermarks and the log of date ranges each append touched
+WATERMARK_FILE = os.path.join(CACHE_DIR, "watermarks.json")
+# A watermark checks the bytes just before it, so in-place edits there force a rebuild
+WATERMARK_TAIL = 1 << 16
+APPEND_LOG_LIMIT = 50
+
+# Typed columnar store written next to each CSV (cleaned_score.csv -> cleaned_score.parquet)
+STORE_EXTENSION = '.parquet'
+
+# Column schema for cleaned_score.csv and form.csv. kind is the in-memory type
+# (floats are held as float32, or int16 for counts that are whole and complete);
+# unit says how a float is scaled, so downstream code never has to guess:
+#   ratio     0-1  (half win rates, FBSR)         percent   0-100 (post-plant success)
+#   count     whole events (kills, rounds)        flag      0/1 (pistol won)
+#   per_round average per round (KPR)             score / seconds  raw values >= 0
+ColumnSpec = namedtuple('ColumnSpec', ['kind', 'unit'])
+UNIT_RANGES = {
+    'ratio': (0, 1), 'percent': (0, 100), 'flag': (0, 1),
+    'count': (0, None), 'per_round': (0, None), 'score': (0, None), 'seconds': (0, None),
+}
+_LABEL = ColumnSpec('category', None)
+SCHEMA = {
+    'Date': ColumnSpec('datetime', None),
+    # labels shared by both sheets
+    'Map': _LABEL, 'Column 1': _LABEL, 'Agent': _LABEL, 'Player': _LABEL, 'Result': _LABEL,
+    'Outcome': _LABEL, 'Start': _LABEL, 'ZETA': _LABEL, 'Atk 2nd': _LABEL, 'Def 2nd': _LABEL,
+    # cleaned_score.csv
+    'First Pistol': ColumnSpec('float', 'flag'),
+    'Second Pistol': ColumnSpec('float', 'flag'),
+    'First Rounds': ColumnSpec('float', 'count'),
+    'Second Rounds': ColumnSpec('float', 'count'),
+    'First Half WR': ColumnSpec('float', 'ratio'),
+    'Second Half WR': ColumnSpec('float', 'ratio'),
+    'Atk_PP_Success': ColumnSpec('float', 'percent'),
+    'Def_PP_Success': ColumnSpec('float', 'percent'),
+    # derived at ingest by derive_side_win_rates
+    'Atk WR Derived': ColumnSpec('float', 'ratio'),
+    'Def WR Derived': ColumnSpec('float', 'ratio'),
+    # form.csv
+    'Rounds': ColumnSpec('float', 'count'),
+    'Kills': ColumnSpec('float', 'count'),
+    'Deaths': ColumnSpec('float', 'count'),
+    'Assists': ColumnSpec('float', 'count'),
+    'FK': ColumnSpec('float', 'count'),
+    'FD': ColumnSpec('float', 'count'),
+    'FK+FD': ColumnSpec('float', 'count'),
+    'Plants': ColumnSpec('float', 'count'),
+    'Defuses': ColumnSpec('float', 'count'),
+    'ACS': ColumnSpec('float', 'score'),
+    'FBSR': ColumnSpec('float', 'ratio'),
+    'Atk_Entry': ColumnSpec('float', 'ratio'),
+    'FKPR': ColumnSpec('float', 'per_round'),
+    'KPR': ColumnSpec('float', 'per_round'),
+    'K+A PR': ColumnSpec('float', 'per_round'),
+    'Multi_Kills': ColumnSpec('float', 'per_round'),
+    'Anchor_Time': ColumnSpec('float', 'seconds'),
+}
+
+# Fixed label dictionaries: every file encodes these columns against the same
+# categories (the agents in AGENT_ROLES, one per assets/agents icon), so their
+# codes line up across files and appends. Unknown labels are added, not dropped.
+KNOWN_LABELS = {'Agent': sorted(AGENT_ROLES)}
+INT16 = np.iinfo(np.int16)
+
+# Every date label we've seen carries at least one digit ("Jan 15", "2026/1/15"),
+# so anything without one skips the (slow) fuzzy parse entirely
+_DATE_HINT = re.compile(r'\d')
+
+
+@lru_cache(maxsize=4096)
+def parse_date_label(value):
     """
-    Cleans scrim tracking sheets with date-labeled section headers
-    and blocks of match data. Assumes headers are already present.
+    Normalises a section-header date label to YYYY-MM-DD, or returns None if
+    it doesn't parse as a date. Memoised: a sheet repeats the same few labels.
     """
-    if path.endswith('.xlsx'):
+    if not _DATE_HINT.search(value):
+        return None
+    try:
+        return parser.parse(value, fuzzy=True).strftime('%Y-%m-%d')
+    except (ValueError, OverflowError):
+        return None
+
+
+def _read_chunks(path, chunksize):
+    if isinstance(path, str) and path.endswith('.xlsx'):
+        # read_excel can't stream; slice the sheet so the rest of the pipeline can
         raw_df = pd.read_excel(path)
+        for start in range(0, len(raw_df), chunksize):
+            yield raw_df.iloc[start:start + chunksize]
     else:
-        raw_df = pd.read_csv(path)
-
-    raw_rows = raw_df.values.tolist()
-    cleaned_rows = []
-    current_date = None
-
-    def is_date_string(value):
-        try:
-            parser.parse(str(value), fuzzy=True)
-            return True
-        except:
-            return False
-
-    for i, row in enumerate(raw_rows):
-        first_cell = str(row[0]).strip()
-
-        # Identify date separator row
-        if is_date_string(first_cell) and all(pd.isna(cell) or cell == '' for cell in row[1:]):
-            current_date = parser.parse(first_cell, fuzzy=True).strftime('%Y-%m-%d')
-            print(f"📅 Detected date '{first_cell}' as {current_date} at row {i}")
-            continue
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def iter_clean_chunks(path, chunksize=CHUNK_SIZE, stats=None, carry=None):
+    """
+    Streams a scrim sheet and yields cleaned chunks: date separator rows are
+    dropped and their date is carried onto the match rows that follow.
+    `stats` (a Counter) collects rows / date_headers / matches / skipped.
+    `carry` ({'date': label}) seeds the date in effect before the first row
+    and is left holding the one in effect after the last, so appended rows
+    can be cleaned on their own.
+    """
+    stats = Counter() if stats is None else stats
+    carry = {} if carry is None else carry
+    current_date = carry.get('date')
+
+    for chunk in _read_chunks(path, chunksize):
+        first = chunk.iloc[:, 0]
+        rest = chunk.iloc[:, 1:]
+
+        # Identify date separator rows: only the first cell is filled and it parses as a date
+        candidates = first.notna() & (rest.isna() | (rest == '')).all(axis=1)
+        labels = pd.Series(None, index=chunk.index, dtype=object)
+        labels[candidates] = first[candidates].astype(str).str.strip().map(parse_date_label)
+        is_header = labels.notna()
+
+        # Carry the last seen date forward, including across chunk boundaries
+        dates = labels.ffill()
+        if current_date is not None:
+            dates = dates.fillna(current_date)
+        if dates.notna().any():
+            current_date = carry['date'] = dates.iloc[-1]
 
         # Match row (at least team name + map + side must be present)
-        if current_date and pd.notna(row[0]) and pd.notna(row[1]) and pd.notna(row[2]):
-            cleaned_rows.append([current_date] + row)
-        else:
-            print(f"⚠️ Skipping row {i}: missing date or core values -> {row[:5]}")
+        keep = ~is_header & dates.notna() & chunk.iloc[:, :3].notna().all(axis=1)
+        skipped = ~is_header & ~keep
+
+        stats['rows'] += len(chunk)
+        stats['date_headers'] += int(is_header.sum())
+        stats['matches'] += int(keep.sum())
+        stats['skipped'] += int(skipped.sum())
+        if logger.isEnabledFor(logging.DEBUG):
+            for i in chunk.index[is_header]:
+                logger.debug("Detected date %r as %s at row %d", first[i], labels[i], i)
+            for i in chunk.index[skipped]:
+                logger.debug("Skipping row %d: missing date or core values -> %s", i, chunk.loc[i].tolist()[:5])
+
+        cleaned = chunk[keep]
+        cleaned.insert(0, 'Date', dates[keep], allow_duplicates=True)
+        yield cleaned
+
+
+def clean_scrim_form(path, chunksize=CHUNK_SIZE, carry=None):
+    """
+    Cleans scrim tracking sheets with date-labeled section headers
+    and blocks of match data. Assumes headers are already present.
+    """
+    stats = Counter()
+    chunks = [chunk for chunk in iter_clean_chunks(path, chunksize, stats, carry) if not chunk.empty]
+    logger.info(
+        "Cleaned %s: %d rows read, %d date headers, %d matches, %d skipped",
+        path, stats['rows'], stats['date_headers'], stats['matches'], stats['skipped']
+    )
 
-    if not cleaned_rows:
+    if not chunks:
         raise ValueError("❌ No valid matches found in file")
 
-    columns = ['Date'] + raw_df.columns.tolist()
-    return pd.DataFrame(cleaned_rows, columns=columns)
+    return pd.concat(chunks, ignore_index=True)
 
-# Run this when executed directly
-if __name__ == "__main__":
-    df = clean_scrim_form("score.csv")
+
+def _to_float(series, unit):
+    # A bare number is already in the column's declared unit; only an explicit
+    # "%" is converted ("43%" is 0.43 as a ratio, 43 as a percent). Never
+    # inferred from the values, so every batch of a column converts the same way
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64')
+    text = series.astype(str).str.strip()
+    percent_mask = text.str.endswith('%')
+    values = pd.to_numeric(text.str.rstrip('%'), errors='coerce').astype('float64')
+    if unit == 'ratio':
+        values = values.where(~percent_mask, values / 100)
+    return values
+
+
+def _compact(values, unit):
+    # float32 keeps ~7 significant digits, far more than any sheet stat has
+    if (unit == 'count' and values.notna().all() and (values == values.round()).all()
+            and values.between(INT16.min, INT16.max).all()):
+        return values.astype('int16')
+    return values.astype('float32')
+
+
+def _to_category(series, known=None):
+    values = series.astype('category')
+    if known is None:
+        return values
+    extra = [c for c in values.cat.categories if c not in set(known)]
+    return values.cat.set_categories(sorted([*known, *extra]))
+
+
+def normalise_types(df):
+    """
+    Returns a copy of a cleaned score / form frame converted to SCHEMA:
+    stripped headers, blank trailing columns dropped, Date as datetime64,
+    stats as float in their declared unit and repeated labels as
+    categoricals. Out-of-range values are logged, not dropped.
+    """
+    # Every converted column is replaced, not written into, so a shallow copy
+    # is enough to leave the caller's frame untouched
+    df = df.copy(deep=False)
+    df.columns = df.columns.astype(str).str.strip()
+    # Trailing commas in the sheets export as empty "Unnamed: N" columns
+    blank = [c for c in df.columns if c.startswith('Unnamed') and df[c].isna().all()]
+    df = df.drop(columns=blank)
+
+    for col, spec in SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if spec.kind == 'datetime':
+            df[col] = pd.to_datetime(df[col], errors='coerce', format='mixed')
+        elif spec.kind == 'float':
+            df[col] = _compact(_to_float(df[col], spec.unit), spec.unit)
+        elif spec.kind == 'category':
+            df[col] = _to_category(df[col], KNOWN_LABELS.get(col))
+    df = derive_side_win_rates(df)
+
+    for col, count in validate(df).items():
+        logger.warning("%s: %d values outside the %s range %s", col, count, SCHEMA[col].unit, UNIT_RANGES[SCHEMA[col].unit])
+    return df
+
+
+def restore_types(df):
+    """
+    Re-applies the categorical and compact dtypes to a frame that is already
+    in SCHEMA units, e.g. typed frames concat widened to object / float64.
+    Values are left as they are; no unit conversion runs.
+    """
+    df = df.copy(deep=False)
+    for col, spec in SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if spec.kind == 'float':
+            df[col] = _compact(df[col].astype('float64'), spec.unit)
+        elif spec.kind == 'category':
+            df[col] = _to_category(df[col], KNOWN_LABELS.get(col))
+    return df
+
+
+def derive_side_win_rates(df):
+    """
+    Adds 'Atk WR Derived' / 'Def WR Derived': the first half is played on the
+    `Start` side and the second half on the other, so each side's WR is one
+    of the two half WRs. NaN when the start side or either half is missing.
+    """
+    halves = ['Start', 'First Half WR', 'Second Half WR']
+    if not set(halves) <= set(df.columns):
+        return df
+    complete = df[halves].notna().all(axis=1)
+    for col, side in (('Atk WR Derived', 'Attack'), ('Def WR Derived', 'Defence')):
+        started_here = (df['Start'] == side).to_numpy(dtype=bool, na_value=False)
+        values = np.where(started_here, df['First Half WR'], df['Second Half WR'])
+        df[col] = pd.Series(values, index=df.index, dtype='float32').where(complete)
+    return df
+
+
+def validate(df):
+    """
+    Counts values outside their unit's range for every schema column in
+    `df`. Returns {column: count} for the columns with any.
+    """
+    problems = {}
+    for col, spec in SCHEMA.items():
+        if col not in df.columns or spec.unit is None:
+            continue
+        low, high = UNIT_RANGES[spec.unit]
+        values = df[col]
+        bad = values < low
+        if high is not None:
+            bad |= values > high
+        if bad.any():
+            problems[col] = int(bad.sum())
+    return problems
+
+
+def memory_report(raw, typed):
+    """
+    Bytes per column of `raw` as read and of `typed` after normalise_types,
+    with a 'total' row.
+    """
+    report = pd.DataFrame({
+        'raw': raw.rename(columns=lambda c: str(c).strip()).memory_usage(deep=True, index=False),
+        'typed': typed.memory_usage(deep=True, index=False),
+    })
+    report.loc['total'] = report.sum()
+    return report
+
+
+def store_path(csv_path):
+    return os.path.splitext(csv_path)[0] + STORE_EXTENSION
+
+
+def file_version(path):
+    """
+    Returns the (mtime, size) fingerprint a cached read of `path` is keyed on.
+    Editing or replacing the file changes it, which forces a re-parse.
+    """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def source_path(path):
+    """
+    The file a dataset is actually read from: the typed Parquet store written
+    by write_store when it is at least as new as the CSV, else the CSV.
+    """
+    store = store_path(path)
+    if os.path.exists(store) and (not os.path.exists(path) or file_version(store) >= file_version(path)):
+        return store
+    return path
+
+
+def write_store(df, csv_path, db_path=None):
+    """
+    Writes the typed Parquet copy of `df` next to `csv_path`, plus its daily
+    rollup (see rollups.py) when it is a score or form frame, and returns the
+    store's path. With `db_path` the frame is also loaded into that SQLite
+    store (see sql_backend.py).
+    """
+    path = store_path(csv_path)
+    typed = normalise_types(df)
+    sizes = memory_report(df, typed).loc['total'] / 2**20
+    logger.info("%s in memory: %.2f MB as read, %.2f MB typed", csv_path, sizes['raw'], sizes['typed'])
+    typed.to_parquet(path, index=False)
+    write_rollup(typed, csv_path)
+    if db_path:
+        write_table(db_path, typed)
+    return path
+
+
+def append_store(df, csv_path, db_path=None):
+    """
+    Adds the rows `df` to the Parquet store next to `csv_path` (and the
+    SQLite store at `db_path`) and merges their rollup into the stored one,
+    re-aggregating only the days they touch. Writes everything from the CSV
+    instead when there is no store yet.
+    """
+    path = store_path(csv_path)
+    if not os.path.exists(path):
+        return write_store(pd.read_csv(csv_path), csv_path, db_path)
+    typed = normalise_types(df)
+    combined = restore_types(pd.concat([pd.read_parquet(path), typed], ignore_index=True))
+    combined.to_parquet(path, index=False)
+    if append_rollup(typed, csv_path) is None:
+        write_rollup(combined, csv_path)
+    if db_path:
+        append_table(db_path, typed, combined)
+    return path
+
+
+def _tail_hash(path, offset):
+    start = max(0, offset - WATERMARK_TAIL)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def sheet_watermark(path, date=None):
+    """
+    Where the next append to CSV `path` starts: its size, a hash of the bytes
+    just before that and the date label in effect there. None for sheets
+    that can't be appended to (.xlsx).
+    """
+    if not path.lower().endswith('.csv'):
+        return None
+    offset = os.path.getsize(path)
+    return {'offset': offset, 'tail_hash': _tail_hash(path, offset), 'date': date}
+
+
+def read_appended(path, watermark):
+    """
+    The header line plus the complete lines appended to CSV `path` since
+    `watermark`, and the watermark after them. None if there is no watermark
+    or the file changed other than by appending.
+    """
+    if not watermark or not path.lower().endswith('.csv'):
+        return None
+    offset = watermark['offset']
+    if os.path.getsize(path) < offset or _tail_hash(path, offset) != watermark['tail_hash']:
+        return None
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(offset)
+        appended = f.read()
+    # A half-written last line waits for the next run
+    end = offset + appended.rfind(b'\n') + 1
+    return header + appended[:end - offset], {**watermark, 'offset': end, 'tail_hash': _tail_hash(path, end)}
+
+
+def _load_watermarks(cache_dir):
+    return _load_state(os.path.join(cache_dir, os.path.basename(WATERMARK_FILE)))
+
+
+def _save_watermarks(watermarks, cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, os.path.basename(WATERMARK_FILE)), 'w') as f:
+        json.dump(watermarks, f, indent=2)
+
+
+def append_log(csv_path, cache_dir=CACHE_DIR):
+    """
+    The appends made to `csv_path` in append mode, oldest first. Each has the
+    dataset version before ('from') and after ('to') it and the first and
+    last day it added rows for ('start' / 'end', None if any were undated).
+    """
+    return _load_watermarks(cache_dir).get(os.path.normpath(csv_path), {}).get('appends', [])
+
+
+def _record_append(entry, csv_path, before, rows):
+    dates = pd.to_datetime(rows['Date'], errors='coerce', format='mixed') if 'Date' in rows else None
+    undated = dates is None or dates.isna().any()
+    entry['appends'] = entry.get('appends', [])[-(APPEND_LOG_LIMIT - 1):] + [{
+        'from': list(before),
+        'to': list(file_version(store_path(csv_path))),
+        'start': None if undated else dates.min().strftime('%Y-%m-%d'),
+        'end': None if undated else dates.max().strftime('%Y-%m-%d'),
+    }]
+
+
+def resolve_sheets(inputs):
+    """
+    Expands directories (every .csv/.xlsx inside) and glob patterns into a
+    sorted, de-duplicated list of sheet paths.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, '*'))
+        else:
+            candidates = glob.glob(item) or [item]
+        paths.update(p for p in candidates if p.lower().endswith(SHEET_EXTENSIONS))
+    return sorted(paths)
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_state(state_file):
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _clean_to_cache(path, cache_path):
+    # Runs in a worker process; only the row count and watermark travel back
+    carry = {}
+    df = clean_scrim_form(path, carry=carry)
+    df.to_pickle(cache_path)
+    return len(df), sheet_watermark(path, carry.get('date'))
+
+
+def _prune_cache(cache_dir, keep):
+    # Cleaned results for content no current sheet has would never be read again
+    for cache_path in glob.glob(os.path.join(cache_dir, '*.pkl')):
+        if os.path.basename(cache_path) not in keep:
+            os.remove(cache_path)
+
+
+def clean_many(inputs, output="cleaned_score.csv", workers=None, cache_dir=CACHE_DIR, db_path=None):
+    """
+    Cleans every sheet matched by `inputs` (directories, globs or paths) and
+    writes one consolidated file to `output`. Sheets whose content hash is
+    unchanged since the last run reuse their cached result; the rest are
+    cleaned in a process pool, and cached results no current sheet matches
+    are deleted. Returns the consolidated DataFrame.
+    """
+    paths = resolve_sheets(inputs)
+    if not paths:
+        raise ValueError(f"❌ No .csv/.xlsx sheets found in {inputs}")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    state_file = os.path.join(cache_dir, os.path.basename(STATE_FILE))
+    previous = _load_state(state_file)
+    watermarks = _load_watermarks(cache_dir)
+    sources = watermarks.get(os.path.normpath(output), {}).get('sources', {})
+
+    hashes = {path: file_hash(path) for path in paths}
+    cache_paths = {path: os.path.join(cache_dir, f"{digest}.pkl") for path, digest in hashes.items()}
+    # CSV sheets cleaned before watermarks existed are re-cleaned once to get one
+    stale = [
+        path for path in paths
+        if previous.get(path) != hashes[path] or not os.path.exists(cache_paths[path])
+        or (path.lower().endswith('.csv') and not sources.get(path))
+    ]
+    logger.info("%d sheets, %d changed since last run", len(paths), len(stale))
+
+    failed = set()
+    if stale:
+        # Imported here: the dashboard imports this module but never cleans sheets
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {path: pool.submit(_clean_to_cache, path, cache_paths[path]) for path in stale}
+            for path, future in futures.items():
+                try:
+                    matches, sources[path] = future.result()
+                    logger.info("Cleaned %s: %d matches", path, matches)
+                except ValueError as e:
+                    logger.warning("Skipping %s: %s", path, e)
+                    failed.add(path)
+
+    frames = [pd.read_pickle(cache_paths[path]) for path in paths if path not in failed]
+    if not frames:
+        raise ValueError("❌ No valid matches found in any sheet")
+    combined = pd.concat(frames, ignore_index=True)
+    combined.to_csv(output, index=False)
+    logger.info("Wrote typed store %s", write_store(combined, output, db_path))
+
+    with open(state_file, 'w') as f:
+        json.dump({path: hashes[path] for path in paths if path not in failed}, f, indent=2)
+    _prune_cache(cache_dir, {os.path.basename(cache_paths[path]) for path in paths if path not in failed})
+    # A full rewrite starts a new append history; unchanged sheets keep their watermark
+    watermarks[os.path.normpath(output)] = {
+        'sources': {path: sources.get(path) for path in paths if path not in failed},
+        'appends': [],
+    }
+    _save_watermarks(watermarks, cache_dir)
+    return combined
+
+
+def append_many(inputs, output="cleaned_score.csv", workers=None, cache_dir=CACHE_DIR, db_path=None):
+    """
+    Cleans only the rows added to each sheet since its watermark, appends
+    them to `output` and merges them into its Parquet store and rollup
+    instead of rewriting them. Falls back to clean_many when `output` or a
+    watermark is missing, the set of sheets changed, or a sheet changed
+    other than by appending. Returns the appended rows.
+    """
+    paths = resolve_sheets(inputs)
+    watermarks = _load_watermarks(cache_dir)
+    entry = watermarks.get(os.path.normpath(output), {})
+    sources = entry.get('sources', {})
+    reads = {}
+    if paths and os.path.exists(output) and set(paths) == set(sources):
+        reads = {path: read_appended(path, sources[path]) for path in paths}
+    if not reads or None in reads.values():
+        logger.info("No usable watermark for every sheet; rebuilding %s", output)
+        return clean_many(inputs, output, workers, cache_dir, db_path)
+
+    frames = []
+    for path, (data, watermark) in reads.items():
+        stats = Counter()
+        carry = {'date': watermark['date']}
+        frames += [chunk for chunk in iter_clean_chunks(io.BytesIO(data), CHUNK_SIZE, stats, carry) if not chunk.empty]
+        sources[path] = {**watermark, 'date': carry.get('date')}
+        logger.info("%s: %d new rows, %d matches", path, stats['rows'], stats['matches'])
+
+    new_rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if not new_rows.empty:
+        before = file_version(source_path(output))
+        columns = pd.read_csv(output, nrows=0).columns
+        new_rows.reindex(columns=columns).to_csv(output, mode='a', header=False, index=False)
+        logger.info("Updated typed store %s", append_store(new_rows, output, db_path))
+        _record_append(entry, output, before, new_rows)
+    entry['sources'] = sources
+    watermarks[os.path.normpath(output)] = entry
+    _save_watermarks(watermarks, cache_dir)
+    return new_rows
+
+
+def convert_store(csv_path, append=False, cache_dir=CACHE_DIR, db_path=None):
+    """
+    Writes the typed Parquet store and rollup for an already-clean CSV such
+    as form.csv. With `append`, rows added since the last conversion are
+    merged into them instead, when the CSV only grew.
+    """
+    watermarks = _load_watermarks(cache_dir)
+    key = os.path.normpath(csv_path)
+    entry = watermarks.get(key, {})
+    read = None
+    if append and os.path.exists(store_path(csv_path)):
+        read = read_appended(csv_path, entry.get('sources', {}).get(csv_path))
+
+    if read is None:
+        path = write_store(pd.read_csv(csv_path), csv_path, db_path)
+        entry = {'sources': {csv_path: sheet_watermark(csv_path)}, 'appends': []}
+    else:
+        data, watermark = read
+        new_rows = pd.read_csv(io.BytesIO(data))
+        path = store_path(csv_path)
+        if not new_rows.empty:
+            before = file_version(path)
+            append_store(new_rows, csv_path, db_path)
+            _record_append(entry, csv_path, before, new_rows)
+        entry['sources'] = {csv_path: watermark}
+    watermarks[key] = entry
+    _save_watermarks(watermarks, cache_dir)
+    return path
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Clean scrim tracking sheets into cleaned_score.csv")
+    arg_parser.add_argument('inputs', nargs='*',
+                            help="sheet paths, directories or glob patterns (default: score.csv)")
+    arg_parser.add_argument('-o', '--output', default="cleaned_score.csv")
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help="worker processes for cleaning (default: one per CPU)")
+    arg_parser.add_argument('--convert', nargs='+', metavar='CSV', default=[],
+                            help="also write typed Parquet stores for already-clean CSVs such as form.csv")
+    arg_parser.add_argument('--append', action='store_true',
+                            help="only process rows appended since the last run (full rebuild if a sheet was edited)")
+    arg_parser.add_argument('--memory', nargs='+', metavar='CSV', default=[],
+                            help="print the per-column memory footprint of these CSVs as read and typed")
+    arg_parser.add_argument('--sqlite', metavar='DB', default=None,
+                            help="also load the outputs into this SQLite file (dashboard: set SCRIM_DB to it)")
+    args = arg_parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for csv_path in args.memory:
+        raw = pd.read_csv(csv_path)
+        print(f"🧮 {csv_path} (bytes)")
+        print(memory_report(raw, normalise_types(raw)).to_string())
+    if args.memory and not (args.convert or args.inputs):
+        return
+    for csv_path in args.convert:
+        print(f"📦 Wrote {convert_store(csv_path, args.append, db_path=args.sqlite)}")
+    if args.convert and not args.inputs:
+        return
+
+    if args.append:
+        df = append_many(args.inputs or ["score.csv"], args.output, args.workers, db_path=args.sqlite)
+        print(f"➕ Appended {len(df)} matches to {args.output}")
+        return
+
+    df = clean_many(args.inputs or ["score.csv"], args.output, args.workers, db_path=args.sqlite)
     print(f"✅ Cleaned {len(df)} matches:")
     print(df.head(10))
     print(f"📊 Total matches (based on outcomes): {df['Outcome'].notna().sum()}")
-    df.to_csv("cleaned_score.csv", index=False)
-    print("📁 Saved to cleaned_score.csv")
+    print(f"📁 Saved to {args.output}")
+
+
+# Run this when executed directly
+if __name__ == "__main__":
+    main()
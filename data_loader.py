@@ -0,0 +1,169 @@
+import os
+import weakref
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from data_cleaner import append_log, file_version, normalise_types, source_path
+from rollups import build_rollup, rollup_path
+
+FORM_PATH = "form.csv"
+SCORE_PATH = "cleaned_score.csv"
+
+# Views of form.csv a section reads instead of keeping its own file:
+# {form.csv column: name in the view}. ACS_VIEW replaces foracs.csv, which was
+# a hand-maintained copy of exactly these columns.
+ACS_VIEW = {'Column 1': 'Map', 'Player': 'Player', 'ACS': 'ACS', 'Agent': 'Agent', 'Date': 'Date', 'Result': 'Result'}
+
+# pandas 3 always copies on write; pandas 2 has to opt in, so that writing to a
+# shallow copy handed out below can never reach the shared cached frame
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Every cached dataset / rollup, for memory reporting; entries go when the
+# lru caches drop them
+_shared = weakref.WeakValueDictionary()
+
+
+def _share(key, df):
+    if df is not None:
+        _shared[key] = df
+    return df
+
+
+@lru_cache(maxsize=16)
+def _read_csv(path, mtime_ns, size):
+    # mtime_ns and size are only part of the cache key
+    return _share(('csv', path, mtime_ns, size), normalise_types(pd.read_csv(path)))
+
+
+@lru_cache(maxsize=32)
+def _read_store(path, mtime_ns, size, columns):
+    # Parquet is columnar, so each column set is read on its own
+    return _share(('store', path, mtime_ns, size, columns), pd.read_parquet(path, columns=list(columns) if columns else None))
+
+
+def load_dataset(path, columns=None):
+    """
+    Loads `path` (or its Parquet store) once per (file, mtime, size) and hands
+    out a shallow copy, so callers can add or reassign columns without
+    touching the cached frame. `columns` restricts the result to those
+    columns; with a Parquet store only they are read from disk.
+    """
+    columns = tuple(columns) if columns else None
+    source = source_path(path)
+    if source == path:
+        df = _read_csv(path, *file_version(path))
+        return (df[list(columns)] if columns else df).copy(deep=False)
+    return _read_store(source, *file_version(source), columns).copy(deep=False)
+
+
+def dataset_version(path):
+    return file_version(source_path(path))
+
+
+def range_version(path, start=None, end=None):
+    """
+    Cache key for a query over days `start`..`end` of `path`: its dataset
+    version, except that appends (data_cleaner --append) which added no rows
+    in that range are stepped back over, so results cached for other date
+    ranges survive a day's new scrims.
+    """
+    version = dataset_version(path)
+    for entry in reversed(append_log(path)):
+        if tuple(entry['to']) != version or _touches(entry, start, end):
+            break
+        version = tuple(entry['from'])
+    return version
+
+
+def _touches(entry, start, end):
+    if entry['start'] is None:
+        return True
+    return ((end is None or pd.Timestamp(entry['start']) <= pd.Timestamp(end))
+            and (start is None or pd.Timestamp(entry['end']) >= pd.Timestamp(start)))
+
+
+@lru_cache(maxsize=8)
+def _read_rollup(path, mtime_ns, size):
+    return _share(('rollup', path, mtime_ns, size), pd.read_parquet(path))
+
+
+@lru_cache(maxsize=8)
+def _build_rollup(path, version):
+    # version is only part of the cache key
+    return _share(('built rollup', path, version), build_rollup(load_dataset(path)))
+
+
+def load_rollup(path):
+    """
+    The daily rollup cube for `path`: the one data_cleaner wrote next to it
+    when it is at least as new as the data, else built from the dataset once
+    per data version. None for datasets without a rollup.
+    """
+    stored = rollup_path(path)
+    if os.path.exists(stored) and file_version(stored) >= dataset_version(path):
+        return _read_rollup(stored, *file_version(stored))
+    return _build_rollup(path, dataset_version(path))
+
+
+def load_form(columns=None):
+    return load_dataset(FORM_PATH, columns)
+
+
+def load_score(columns=None):
+    return load_dataset(SCORE_PATH, columns)
+
+
+def form_view(view):
+    """
+    Projection of form.csv onto the columns of `view`, renamed. Only those
+    columns are read (from the Parquet store) and they share memory with the
+    cached form data.
+    """
+    return load_form(list(view)).rename(columns=view)
+
+
+def load_acs_view():
+    return form_view(ACS_VIEW)
+
+
+def _column_buffer(series):
+    # The ndarray a column's values ultimately live in (codes for categoricals)
+    values = series.array
+    values = values.codes if isinstance(values, pd.Categorical) else series.to_numpy(copy=False)
+    while isinstance(values.base, np.ndarray):
+        values = values.base
+    return values
+
+
+def shared_bytes():
+    """
+    Bytes held once per process by the cached datasets and rollups, however
+    many sessions use them.
+    """
+    sizes = {}
+    for df in list(_shared.values()):
+        for _, series in df.items():
+            sizes[id(_column_buffer(series))] = series.memory_usage(deep=True, index=False)
+    return sum(sizes.values())
+
+
+def private_bytes(df):
+    """
+    Bytes of `df` that aren't shared with a cached dataset: columns that
+    were filtered, converted or computed rather than handed out by load_*.
+    """
+    shared = {id(_column_buffer(series)) for frame in list(_shared.values()) for _, series in frame.items()}
+    return sum(
+        series.memory_usage(deep=True, index=False)
+        for _, series in df.items() if id(_column_buffer(series)) not in shared
+    )
+
+
+def clear_cache():
+    _read_csv.cache_clear()
+    _read_store.cache_clear()
+    _read_rollup.cache_clear()
+    _build_rollup.cache_clear()
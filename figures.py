@@ -0,0 +1,469 @@
+import pandas as pd
+
+import analytics
+from asset_cache import agent_icon_html, agent_icon_stylesheet
+
+# The dashboard's charts, built from the summary tables analytics / rollups /
+# sql_backend return, so the dashboard and benchmarks/bench_dashboard.py draw
+# (and time) the same figures. plotly is imported per function: the login page
+# and a worker's cold start don't pay for it.
+
+# Post-plant table column -> the label its bar is drawn with
+POST_PLANT_LABELS = {
+    "Atk_PP_Success": "Post Plant",
+    "Def_PP_Success": "Retakes"
+}
+
+
+def map_win_rates(summary):
+    """
+    Overview: horizontal win-rate bar per map from analytics.map_summary.
+    """
+    import plotly.express as px
+
+    winrate_df = summary[['Map', 'Win Rate']].dropna()
+    winrate_df['Win Rate %'] = winrate_df['Win Rate'] * 100
+    winrate_df = winrate_df.sort_values(by='Win Rate %', ascending=False)
+
+    fig_map_wr = px.bar(
+        winrate_df,
+        x='Win Rate %',
+        y='Map',
+        orientation='h',
+        text=winrate_df['Win Rate %'].apply(lambda x: f"{x:.1f}%"),
+        title="Map Win Rates",
+        labels={'Win Rate %': 'Win Rate (%)', 'Map': 'Map'},
+        color='Win Rate %',
+        color_continuous_scale=['#8B0000', '#DC143C']
+    )
+
+    fig_map_wr.update_traces(
+        textposition='outside',
+        marker_line_color='#000000',
+        marker_line_width=1.2
+    )
+
+    fig_map_wr.update_layout(
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(family='Inter', size=14, color='#DC143C'),
+        title_font=dict(size=20, color='#DC143C'),
+        yaxis=dict(
+            tickfont=dict(color='#ffffff'),
+            categoryorder='total ascending',
+            gridcolor='#333333'
+        ),
+        xaxis=dict(
+            title='Win Rate (%)',
+            title_font=dict(color='#DC143C'),
+            tickfont=dict(color='#ffffff'),
+            gridcolor='#333333',
+            range=[0, 100]
+        )
+    )
+    return fig_map_wr
+
+
+def composition_html(grouped):
+    """
+    The rib.gg-style composition bars for a CompositionIndex.table(): the
+    agent icon stylesheet plus one bar per composition, scaled to the best
+    win rate.
+    """
+    # Calculate max width for bar scaling
+    max_win_rate = grouped['Win Rate %'].max()
+
+    # Icons are classes in one stylesheet (see asset_cache.py), so each
+    # agent's image is encoded once per process and sent once per page
+    rows_html = [agent_icon_stylesheet({agent for comp in grouped['Composition'] for agent in comp})]
+    for composition, win_rate, games in zip(grouped['Composition'], grouped['Win Rate %'], grouped['games']):
+        # Calculate bar width percentage (scale to fit remaining space)
+        bar_width_percent = (win_rate / max_win_rate * 80) if max_win_rate > 0 else 0
+        icons_html = "".join(agent_icon_html(agent) for agent in composition)
+
+        # Create the complete composition bar (rib.gg style)
+        rows_html.append(
+            '<div class="composition-container"><div class="composition-bar">'
+            f'<div class="bar-background" style="width: {bar_width_percent}%;"></div>'
+            f'<div class="agents-container">{icons_html}</div>'
+            '<div class="win-rate-info">'
+            f'<div class="win-percentage">{win_rate:.1f}%</div>'
+            f'<div class="game-count">({games} games)</div>'
+            '</div></div></div>'
+        )
+    return "\n".join(rows_html)
+
+
+def agent_heatmap(pivot, pivot_wins, pivot_games):
+    """
+    Win rate % per player (rows) and agent (columns) from
+    analytics.agent_win_grid, with agents a player never played in grey.
+    """
+    import plotly.graph_objects as go
+
+    all_players, all_agents = list(pivot.index), list(pivot.columns)
+    # Not played = -1 for light grey
+    NOT_PLAYED = -1
+    z = pivot.values.copy()
+    z[pd.isna(z)] = NOT_PLAYED
+    z = z.astype(float)
+    # Build customdata: for hover - "Not played" or "Win Rate: X% (w/g)"
+    customdata = []
+    for player in all_players:
+        row = []
+        for agent in all_agents:
+            g = pivot_games.loc[player, agent] if pd.notna(pivot_games.loc[player, agent]) else 0
+            g = int(g)
+            if g == 0:
+                row.append("Not played")
+            else:
+                w = int(pivot_wins.loc[player, agent]) if pd.notna(pivot_wins.loc[player, agent]) else 0
+                wr = pivot.loc[player, agent]
+                wr = float(wr) if pd.notna(wr) else 0
+                row.append(f"Win Rate: {wr:.0f}% ({w}/{g})")
+        customdata.append(row)
+    # Text: show % only where played
+    text = [[f"{v:.0f}%" if v >= 0 else "" for v in row] for row in z]
+    fig_heat = go.Figure(data=go.Heatmap(
+        z=z,
+        x=all_agents,
+        y=all_players,
+        customdata=customdata,
+        zmin=NOT_PLAYED,
+        zmax=100,
+        colorscale=[[0, '#9ca3af'], [0.01, '#dc2626'], [0.06, '#fef08a'], [0.36, '#86efac'], [0.66, '#22c55e'], [1, '#14532d']],
+        text=text,
+        texttemplate="%{text}",
+        textfont=dict(family='Rajdhani', size=12, color='white'),
+        hoverongaps=False,
+        hovertemplate="Player: %{y}<br>Agent: %{x}<br>%{customdata}<extra></extra>"
+    ))
+    fig_heat.update_layout(
+        title="Win Rate % by Player and Agent",
+        xaxis=dict(title='Agent', side='bottom', tickangle=-45, tickfont=dict(family='Rajdhani', color='#FDB913')),
+        yaxis=dict(title='Player', tickfont=dict(family='Rajdhani', color='#FDB913'), autorange='reversed'),
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(family='Rajdhani', color='#FDB913'),
+        title_font=dict(size=18, color='#FDB913'),
+        margin=dict(l=80, r=40, t=60, b=120),
+        height=max(400, 48 * len(pivot.index) + 120),
+        width=max(400, 48 * len(pivot.columns) + 100)
+    )
+    return fig_heat
+
+
+def side_win_rates(summary):
+    """
+    Round Insights: attack vs defence win rate bars per map from
+    analytics.round_summary, best map first.
+    """
+    import plotly.express as px
+
+    # Prepare data
+    plot_df = summary[['Map', 'Raw_Atk_WR', 'Raw_Def_WR']].rename(columns={'Raw_Atk_WR': 'Attack', 'Raw_Def_WR': 'Defense'})
+    plot_df['Attack'] *= 100
+    plot_df['Defense'] *= 100
+
+    # Melt for plotting
+    plot_df = plot_df.melt(id_vars='Map', var_name='Side', value_name='Win Rate (%)')
+    plot_df['Map'] = pd.Categorical(plot_df['Map'], categories=plot_df.groupby('Map', observed=True)['Win Rate (%)'].mean().sort_values(ascending=False).index, ordered=True)
+
+    # Wolves color map
+    color_map = {
+        'Attack': '#DC143C',   # Red
+        'Defense': '#ffffff'   # White
+    }
+
+    fig = px.bar(
+        plot_df,
+        x='Map',
+        y='Win Rate (%)',
+        color='Side',
+        color_discrete_map=color_map,
+        barmode='group',
+        text=plot_df['Win Rate (%)'].apply(lambda x: f"{x:.1f}%"),
+        title="Attack vs Defense Win Rates by Map"
+    )
+
+    fig.update_traces(
+        textposition='outside',
+        marker_line_color='#333333',
+        marker_line_width=1.2,
+        width=0.4
+    )
+
+    fig.update_layout(
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(color='#DC143C', family='Inter'),
+        title_font=dict(color='#DC143C', size=20),
+        legend_title_text='Side',
+        xaxis=dict(tickangle=-25, gridcolor='#333333'),
+        yaxis=dict(range=[0, 100], gridcolor='#333333')
+    )
+    return fig
+
+
+def post_plant(pp_df, sort_col, ascending=False):
+    """
+    Stacked post-plant + retake success bars per map from
+    analytics.post_plant_table, ordered by `sort_col`.
+    """
+    import plotly.express as px
+
+    pp_df = pp_df.sort_values(by=sort_col, ascending=ascending)
+    pp_df['Map'] = pd.Categorical(pp_df['Map'], categories=pp_df['Map'], ordered=True)
+
+    pp_df = pp_df.rename(columns=POST_PLANT_LABELS)
+    pp_df_long = pp_df.melt(id_vars='Map', var_name='Side', value_name='Post-Plant Success (%)')
+
+    fig_pp = px.bar(
+        pp_df_long,
+        x='Map',
+        y='Post-Plant Success (%)',
+        color='Side',
+        barmode='stack',
+        text=pp_df_long['Post-Plant Success (%)'].apply(lambda x: f"{x:.1f}%"),
+        title="Post-Plant Success Rate (Stacked Atk + Def)",
+        color_discrete_map={
+            'Post Plant': '#DC143C',
+            'Retakes': '#ffffff'
+        }
+    )
+
+    fig_pp.update_traces(
+        textposition='inside',
+        marker_line_color='#333333',
+        marker_line_width=1.2
+    )
+
+    fig_pp.update_layout(
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(family='Inter, sans-serif', size=14, color='#DC143C'),
+        title_font=dict(size=20, color='#DC143C'),
+        xaxis=dict(
+            title='Map',
+            title_font=dict(size=16, color='#DC143C'),
+            tickfont=dict(size=14, color='#ffffff'),
+            tickangle=-25,
+            gridcolor='#333333'
+        ),
+        yaxis=dict(
+            title='Post-Plant Success (%)',
+            title_font=dict(size=16, color='#DC143C'),
+            tickfont=dict(size=14, color='#ffffff'),
+            gridcolor='#333333',
+            range=[0, 100]
+        ),
+        legend=dict(
+            font=dict(size=13, color='#ffffff')
+        )
+    )
+    return fig_pp
+
+
+def pistol_rates(grouped):
+    """
+    Pistol win rate bar per map from analytics.pistol_rates.
+    """
+    import plotly.express as px
+
+    fig_pistol = px.bar(
+        grouped,
+        x='Map',
+        y='Pistol Win Rate (%)',
+        text=grouped['Pistol Win Rate (%)'].apply(lambda x: f"{x:.1f}%"),
+        color='Pistol Win Rate (%)',
+        color_continuous_scale=['#8B0000', '#DC143C'],
+        title="Pistol Win Rates by Map"
+    )
+
+    fig_pistol.update_traces(
+        textposition='outside',
+        marker_line_color='#000000',
+        marker_line_width=1.2
+    )
+
+    fig_pistol.update_layout(
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(family='Inter', size=14, color='#DC143C'),
+        title_font=dict(size=20, color='#DC143C'),
+        xaxis=dict(tickfont=dict(color='#ffffff'), gridcolor='#333333'),
+        yaxis=dict(range=[0, 100], title='Win Rate (%)', title_font=dict(color='#DC143C'), tickfont=dict(color='#ffffff'), gridcolor='#333333')
+    )
+    return fig_pistol
+
+
+def _round_pie(pie_data, title, colors):
+    import plotly.express as px
+
+    fig_pie = px.pie(
+        pie_data,
+        names='Conversion',
+        values='Percentage',
+        title=title,
+        color='Conversion',
+        color_discrete_map=colors,
+        hole=0.4
+    )
+
+    fig_pie.update_traces(
+        textinfo='label+percent',
+        marker_line_color='#000000',
+        marker_line_width=1.5
+    )
+
+    fig_pie.update_layout(
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(family='Inter', size=14, color='#DC143C'),
+        title_font=dict(size=18, color='#DC143C'),
+        legend=dict(font=dict(color='#ffffff'))
+    )
+    return fig_pie
+
+
+def conversion_pie(pie_data_win, map_name):
+    """
+    WW / WL split after a pistol win (first frame of
+    analytics.second_round_conversions).
+    """
+    return _round_pie(pie_data_win, f"Pistol Conversion - {map_name}", {'WW': '#DC143C', 'WL': '#666666'})
+
+
+def eco_pie(pie_data_loss, map_name):
+    """
+    LL / LW split after a pistol loss (second frame of
+    analytics.second_round_conversions).
+    """
+    return _round_pie(pie_data_loss, f"Eco Round Outcomes - {map_name}", {'LL': '#444444', 'LW': '#3b82f6'})
+
+
+def beeswarm(rows, player):
+    """
+    ACS per game for `player`, one column of points per map coloured by
+    agent, from analytics.acs_rows (non-empty), with the average as a line.
+    """
+    import plotly.express as px
+
+    avg_acs = rows['ACS'].mean()
+    # Point offsets come from analytics.beeswarm_positions (binned, no
+    # collision search); WebGL keeps thousands of points responsive
+    swarm, swarm_maps = analytics.beeswarm_positions(rows)
+    fig_swarm = px.scatter(
+        swarm,
+        x='x',
+        y='ACS',
+        color='Agent',
+        hover_data={'x': False, 'Map': True, 'Date': '|%Y-%m-%d', 'Result': True},
+        render_mode='webgl',
+        title=f"{player}'s ACS by Agent & Map"
+    )
+    fig_swarm.update_traces(marker=dict(size=8, line=dict(width=0.5, color='#000000')))
+    fig_swarm.add_hline(
+        y=avg_acs,
+        line_dash='dash',
+        line_color='#DC143C',
+        line_width=1.5,
+        annotation_text=f"Avg ACS: {avg_acs:.1f}",
+        annotation_position='top left',
+        annotation_font_color='#DC143C'
+    )
+    fig_swarm.update_layout(
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(family='Inter', color='#ffffff'),
+        title_font=dict(size=18, color='#DC143C'),
+        xaxis=dict(
+            title='Map',
+            tickmode='array',
+            tickvals=list(range(len(swarm_maps))),
+            ticktext=swarm_maps,
+            range=[-0.6, len(swarm_maps) - 0.4],
+            showgrid=False,
+            zeroline=False
+        ),
+        yaxis=dict(title='ACS', gridcolor='#333333'),
+        legend=dict(title='Agent', bgcolor='#1a1a1a')
+    )
+    return fig_swarm
+
+
+def radar(radar_inputs, player, role):
+    """
+    Player vs VCT benchmark radar for `role` from analytics.radar_inputs,
+    with each stat's difference from the benchmark listed alongside.
+    """
+    import plotly.graph_objects as go
+
+    benchmark = analytics.VCT_BENCHMARKS[role]
+    categories, player_avg, player_values, benchmark_values = radar_inputs
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=player_values,
+        theta=categories,
+        fill='toself',
+        name=f"{player}",
+        line=dict(color="#DC143C")
+    ))
+    fig.add_trace(go.Scatterpolar(
+        r=benchmark_values,
+        theta=categories,
+        fill='toself',
+        name=f"VCT {role} Avg",
+        line=dict(color="#444444")
+    ))
+
+    raw_values = []
+    for stat in categories:
+        val = player_avg[stat]
+        bmark = benchmark[stat]
+        diff = val - bmark
+        sign = '+' if diff >= 0 else ''
+        color = "#14532d" if diff >= 0 else "#7f1d1d"
+
+        # Use % format for relevant stats
+        if stat in ['FBSR', 'FKPR', 'Atk Entry']:
+            raw_values.append(f"<span style='color:{color}'><b>{stat}</b>: {sign}{diff * 100:.1f}%</span>")
+        else:
+            raw_values.append(f"<span style='color:{color}'><b>{stat}</b>: {sign}{diff:.2f}</span>")
+
+    fig.add_annotation(
+        text="<br>".join(raw_values),
+        showarrow=False,
+        align="left",
+        x=0.95,
+        y=0.95,
+        xref="paper",
+        yref="paper",
+        bordercolor="#666",
+        borderwidth=1,
+        bgcolor="rgba(0,0,0,0.85)",
+        font=dict(color="white", size=12)
+    )
+
+    fig.update_layout(
+        polar=dict(
+            bgcolor="#000000",
+            radialaxis=dict(
+                visible=False,
+                showticklabels=False,
+                ticks='',
+                showline=False,
+                gridcolor="#333333"
+            ),
+            angularaxis=dict(tickfont=dict(color="#DC143C"))
+        ),
+        showlegend=True,
+        legend=dict(font=dict(color="#ffffff")),
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(family='Inter', color='#DC143C'),
+        title=dict(text=f"{role} Stats vs VCT Benchmark", font=dict(size=16, color='#DC143C')),
+        margin=dict(l=40, r=40, t=60, b=40)
+    )
+    return fig
@@ -0,0 +1,288 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from analytics import AGENT_ROLES, normalise_outcomes
+
+# Daily rollup written next to each store (form.csv -> form.rollup.parquet)
+ROLLUP_EXTENSION = '.rollup.parquet'
+
+# One cube row per key combination per day. form.csv has no side column, so
+# side only splits the score cube (the match's start side).
+FORM_KEYS = ['Date', 'Map', 'Player', 'Agent']
+SCORE_KEYS = ['Date', 'Map', 'Start']
+
+# Summed as-is
+FORM_TOTALS = ['Rounds', 'Kills', 'Deaths', 'Assists', 'FK', 'Plants']
+# Averaged per row on the dashboard, so stored as a sum plus a non-null count (<stat>_n)
+FORM_MEANS = ['ACS', 'Assists', 'Multi_Kills', 'FBSR', 'FKPR', 'KPR', 'FD', 'Anchor_Time']
+SCORE_MEANS = ['Atk WR Derived', 'Def WR Derived', 'Atk_PP_Success', 'Def_PP_Success']
+SECOND_ROUND_CODES = ['WW', 'WL', 'LL', 'LW']
+
+
+def rollup_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ROLLUP_EXTENSION
+
+
+def _rollup(keys, values):
+    # Rows with a missing key keep their own group so undated rows still count
+    # towards whole-dataset totals; the cube is sorted by day, undated last.
+    # Compact float32 / int16 stats are summed at full width.
+    values = pd.DataFrame(values, index=keys.index)
+    values = values.astype({c: np.result_type(t, np.int64) for c, t in values.dtypes.items()})
+    cube = values.groupby(
+        [keys[k] for k in keys.columns], observed=True, dropna=False, sort=False
+    ).sum()
+    return cube.reset_index().sort_values('Date', na_position='last', kind='stable', ignore_index=True)
+
+
+def _sum_and_count(values, df, columns):
+    for col in columns:
+        if col in df.columns:
+            values[col] = df[col]
+            values[f'{col}_n'] = df[col].notna().astype('int64')
+
+
+def form_rollup(form_df):
+    """
+    Per (day, map, player, agent) sums of form.csv: row count, FORM_TOTALS,
+    sum + count of FORM_MEANS, Atk_Entry (missing as 0) and ACS x Rounds.
+    """
+    keys = pd.DataFrame({
+        'Date': form_df['Date'].dt.normalize(),
+        'Map': form_df['Column 1'],
+        'Player': form_df['Player'],
+        'Agent': form_df['Agent'],
+    })
+    values = {'Rows': np.ones(len(form_df), dtype='int64')}
+    for col in FORM_TOTALS:
+        if col in form_df.columns:
+            values[col] = form_df[col]
+    _sum_and_count(values, form_df, FORM_MEANS)
+    if 'Atk_Entry' in form_df.columns:
+        values['Atk_Entry'] = form_df['Atk_Entry'].fillna(0)
+    if {'ACS', 'Rounds'} <= set(form_df.columns):
+        values['ACS_Rounds'] = form_df['ACS'] * form_df['Rounds']
+    return _rollup(keys, values)
+
+
+def score_rollup(score_df):
+    """
+    Per (day, map, start side) sums of cleaned_score.csv: matches, outcome
+    counts, pistols won, sum + count of SCORE_MEANS and 2nd-round result
+    counts over both halves.
+    """
+    keys = pd.DataFrame({
+        'Date': score_df['Date'].dt.normalize(),
+        'Map': score_df['Map'],
+        'Start': score_df['Start'],
+    })
+    outcomes = normalise_outcomes(score_df['Outcome'])
+    values = {
+        'Matches': np.ones(len(score_df), dtype='int64'),
+        'Games': outcomes.notna().astype('int64'),
+        'Wins': (outcomes == 'win').astype('int64'),
+        'Draws': (outcomes == 'draw').astype('int64'),
+        'Losses': (outcomes == 'loss').astype('int64'),
+        'Pistols_Won': score_df['First Pistol'] + score_df['Second Pistol'],
+    }
+    _sum_and_count(values, score_df, SCORE_MEANS)
+    atk_2nd = score_df['Atk 2nd'].astype(str)
+    def_2nd = score_df['Def 2nd'].astype(str)
+    for code in SECOND_ROUND_CODES:
+        values[f'2nd {code}'] = (atk_2nd == code).astype('int64') + (def_2nd == code).astype('int64')
+    return _rollup(keys, values)
+
+
+def build_rollup(df):
+    """
+    The rollup matching `df`'s shape (score or form), or None for any other
+    frame.
+    """
+    if 'Outcome' in df.columns:
+        return score_rollup(df)
+    if {'Column 1', 'Player', 'Agent'} <= set(df.columns):
+        return form_rollup(df)
+    return None
+
+
+def write_rollup(df, csv_path):
+    """
+    Writes the rollup of typed `df` next to `csv_path` and returns its path,
+    or None when `df` has no rollup.
+    """
+    cube = build_rollup(df)
+    if cube is None:
+        return None
+    path = rollup_path(csv_path)
+    cube.to_parquet(path, index=False)
+    return path
+
+
+def merge_rollups(cube, new_cube):
+    """
+    `cube` with `new_cube` added in. Only the days `new_cube` has rows for are
+    re-aggregated; every other cube row is kept as is.
+    """
+    keys = FORM_KEYS if 'Player' in cube.columns else SCORE_KEYS
+    touched = cube['Date'].isin(new_cube['Date'])
+    combined = pd.concat([cube[touched], new_cube], ignore_index=True)
+    regrouped = combined.groupby(keys, observed=True, dropna=False, sort=False).sum().reset_index()
+    merged = pd.concat([cube[~touched], regrouped], ignore_index=True)
+    # concat widens categoricals with different categories to object
+    for key in keys[1:]:
+        merged[key] = merged[key].astype('category')
+    return merged.sort_values('Date', na_position='last', kind='stable', ignore_index=True)
+
+
+def append_rollup(new_df, csv_path):
+    """
+    Merges the rollup of the typed rows `new_df` into the one stored for
+    `csv_path` and returns its path, or None when there is no stored rollup
+    to merge into.
+    """
+    path = rollup_path(csv_path)
+    new_cube = build_rollup(new_df)
+    if new_cube is None or not os.path.exists(path):
+        return None
+    merge_rollups(pd.read_parquet(path), new_cube).to_parquet(path, index=False)
+    return path
+
+
+def date_range(cube, start=None, end=None):
+    """
+    The cube rows for days between `start` and `end` (inclusive), found by
+    binary search on the sorted Date column rather than a full mask.
+    """
+    if start is None and end is None:
+        return cube
+    dates = cube['Date'].to_numpy()[:cube['Date'].notna().sum()]
+    lo = 0 if start is None else dates.searchsorted(pd.Timestamp(start).to_datetime64(), 'left')
+    hi = len(dates) if end is None else dates.searchsorted(pd.Timestamp(end).normalize().to_datetime64(), 'right')
+    return cube.iloc[lo:hi]
+
+
+def range_totals(cube, by, start=None, end=None, **filters):
+    """
+    Sums of every cube column per `by` over a date range, keeping only rows
+    whose filter columns equal the given values ("All"/None skip a filter).
+    """
+    rows = date_range(cube, start, end)
+    for col, value in filters.items():
+        if value not in (None, "All"):
+            rows = rows[rows[col] == value]
+    return rows.groupby(by, observed=True).sum(numeric_only=True)
+
+
+def _mean(totals, col):
+    return totals[col] / totals[f'{col}_n']
+
+
+def map_summary(score_cube, start, end):
+    """
+    Same table as analytics.map_summary, from the score rollup.
+    """
+    totals = range_totals(score_cube, 'Map', start, end)
+    summary = totals.loc[totals['Games'] > 0, ['Games', 'Wins', 'Draws', 'Losses']]
+    summary = summary.assign(**{'Win Rate': summary['Wins'] / summary['Games']})
+    return summary.reset_index()
+
+
+def round_summary(score_cube, start, end, map_name="All"):
+    """
+    Same table as analytics.round_summary, from the score rollup.
+    """
+    totals = range_totals(score_cube, 'Map', start, end, Map=map_name)
+    totals = totals[totals['Games'] > 0]
+    summary = totals[['Games', 'Wins', 'Draws', 'Losses']].assign(
+        Raw_Atk_WR=_mean(totals, 'Atk WR Derived'),
+        Raw_Def_WR=_mean(totals, 'Def WR Derived'),
+    )
+    summary['Raw_Round_WR'] = (summary['Raw_Atk_WR'] + summary['Raw_Def_WR']) / 2
+    return summary.reset_index()
+
+
+def post_plant_table(score_cube):
+    """
+    Same table as analytics.post_plant_table, from the score rollup.
+    """
+    totals = range_totals(score_cube, 'Map')
+    return pd.DataFrame({
+        'Atk_PP_Success': _mean(totals, 'Atk_PP_Success'),
+        'Def_PP_Success': _mean(totals, 'Def_PP_Success'),
+    }).reset_index()
+
+
+def pistol_rates(score_cube, start, end):
+    """
+    Same table as analytics.pistol_rates, from the score rollup.
+    """
+    totals = range_totals(score_cube, 'Map', start, end)
+    grouped = pd.DataFrame({
+        'Total_Pistols_Won': totals['Pistols_Won'],
+        'Total_Pistols_Played': totals['Matches'] * 2,  # 2 pistol rounds per map
+    }).reset_index()
+    grouped['Pistol Win Rate (%)'] = (grouped['Total_Pistols_Won'] / grouped['Total_Pistols_Played']) * 100
+    return grouped.sort_values(by='Pistol Win Rate (%)', ascending=False)
+
+
+def second_round_conversions(score_cube, start, end, map_name):
+    """
+    Same (win, loss) Conversion / Percentage frames as
+    analytics.second_round_conversions, from the score rollup.
+    """
+    rows = date_range(score_cube, start, end)
+    counts = rows.loc[rows['Map'] == map_name, [f'2nd {code}' for code in SECOND_ROUND_CODES]].sum()
+    counts.index = SECOND_ROUND_CODES
+
+    pies = []
+    for codes in (['WW', 'WL'], ['LL', 'LW']):
+        played = counts[codes]
+        played = played[played > 0].sort_values(ascending=False, kind='stable')
+        pies.append(pd.DataFrame({
+            'Conversion': played.index,
+            'Percentage': played.to_numpy() / played.sum() * 100 if len(played) else [],
+        }))
+    return tuple(pies)
+
+
+def player_agent_stats(form_cube, player, start, end, map_name="All"):
+    """
+    Same table as analytics.player_agent_stats, from the form rollup.
+    """
+    totals = range_totals(form_cube, 'Agent', start, end, Player=player, Map=map_name)
+    agent_stats = totals[['Rounds', 'Kills', 'Deaths', 'Assists']].assign(
+        ACS=_mean(totals, 'ACS'), FK=totals['FK'], Plants=totals['Plants']
+    ).reset_index()
+
+    agent_stats['K/D Ratio'] = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
+    agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
+    return agent_stats
+
+
+def player_role_stats(form_cube, player, start, end, map_name="All"):
+    """
+    Same table as analytics.player_role_stats, from the form rollup.
+    """
+    totals = range_totals(form_cube, 'Agent', start, end, Player=player, Map=map_name)
+    agent_stats = pd.DataFrame({
+        'Rounds': totals['Rounds'],
+        'Kills': totals['Kills'],
+        'Deaths': totals['Deaths'],
+        'Multi_Kills': _mean(totals, 'Multi_Kills'),
+        'Assists': _mean(totals, 'Assists'),
+        'ACS': _mean(totals, 'ACS'),
+        'FK': totals['FK'],
+        'FBSR': _mean(totals, 'FBSR'),
+        'FKPR': _mean(totals, 'FKPR'),
+        'KPR': _mean(totals, 'KPR'),
+        'Atk_Entry': totals['Atk_Entry'] / totals['Rows'],
+        'FD': _mean(totals, 'FD'),
+        'Anchor_Time': _mean(totals, 'Anchor_Time'),
+    }).reset_index()
+
+    agent_stats['K/D Ratio'] = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
+    agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
+    agent_stats['Role'] = agent_stats['Agent'].astype(str).map(AGENT_ROLES)
+    return agent_stats
@@ -0,0 +1,242 @@
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from analytics import AGENT_ROLES
+
+# Optional on-disk store the dashboard queries instead of in-memory frames.
+# data_cleaner.py --sqlite PATH loads it; the dashboard uses it when SCRIM_DB
+# points at it. Same summary functions (and signatures) as rollups.py, with
+# the database path in place of the cube.
+DB_ENV = "SCRIM_DB"
+
+TABLE_INDEXES = {
+    'score': [('Date',), ('Map', 'Date')],
+    'form': [('Date',), ('Player', 'Date'), ('Column 1',), ('Agent',)],
+}
+
+
+def database_path():
+    """
+    The SQLite store named by $SCRIM_DB, or None when it is unset or missing.
+    """
+    path = os.environ.get(DB_ENV)
+    return path if path and os.path.exists(path) else None
+
+
+def database_version():
+    path = database_path()
+    if path is None:
+        return None
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def table_for(df):
+    if 'Outcome' in df.columns:
+        return 'score'
+    if {'Column 1', 'Player', 'Agent'} <= set(df.columns):
+        return 'form'
+    return None
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def write_table(db_path, df, append=False):
+    """
+    Loads the typed frame `df` into its table ('score' or 'form') of the
+    SQLite store at `db_path`, replacing it unless `append`, and creates the
+    Date / Map / Player / Agent indexes. Returns the table name, or None for
+    frames that have no table.
+    """
+    table = table_for(df)
+    if table is None:
+        return None
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        df.to_sql(table, conn, if_exists='append' if append else 'replace', index=False)
+        for columns in TABLE_INDEXES[table]:
+            name = f"idx_{table}_" + "_".join(c.replace(' ', '_') for c in columns)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(map(_quote, columns))})")
+    return table
+
+
+def append_table(db_path, new_df, full_df):
+    """
+    Adds the typed rows `new_df` to their table, or loads all of `full_df`
+    when the store doesn't have that table yet.
+    """
+    table = table_for(new_df)
+    if table is None:
+        return None
+    with closing(sqlite3.connect(db_path)) as conn:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    return write_table(db_path, new_df, append=True) if exists else write_table(db_path, full_df)
+
+
+def _query(db_path, sql, params=()):
+    # Read-only: every session shares the one file
+    with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as conn:
+        result = pd.read_sql_query(sql, conn, params=params)
+    # An aggregate over nothing but NULLs comes back as an all-None object column
+    for col in result.columns[result.isna().all() & (result.dtypes == object)]:
+        result[col] = result[col].astype('float64')
+    return result
+
+
+def _where(start=None, end=None, **filters):
+    # Dates are stored as 'YYYY-MM-DD HH:MM:SS' text, so ISO bounds compare correctly
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("Date >= ?")
+        params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+    if end is not None:
+        clauses.append("Date < ?")
+        params.append((pd.Timestamp(end) + pd.Timedelta(days=1)).strftime('%Y-%m-%d'))
+    for col, value in filters.items():
+        if value not in (None, "All"):
+            clauses.append(f"{_quote(col)} = ?")
+            params.append(value)
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+# Outcome normalised the way analytics.normalise_outcomes does it
+_OUTCOME = "LOWER(TRIM(Outcome))"
+_OUTCOME_COUNTS = f"""
+    COUNT(Outcome) AS Games,
+    SUM({_OUTCOME} = 'win') AS Wins,
+    SUM({_OUTCOME} = 'draw') AS Draws,
+    SUM({_OUTCOME} = 'loss') AS Losses"""
+
+
+def score_rows(db_path, start, end, map_name="All"):
+    """
+    The cleaned_score rows in the date range (and map), as
+    analytics.filter_rows returns them.
+    """
+    where, params = _where(start, end, Map=map_name)
+    rows = _query(db_path, f"SELECT * FROM score {where}", params)
+    rows['Date'] = pd.to_datetime(rows['Date'])
+    return rows
+
+
+def map_summary(db_path, start, end):
+    """
+    Same table as analytics.map_summary, as one grouped query.
+    """
+    where, params = _where(start, end)
+    summary = _query(db_path, f"""
+        SELECT Map, {_OUTCOME_COUNTS}
+        FROM score {where}
+        GROUP BY Map HAVING Map IS NOT NULL AND COUNT(Outcome) > 0 ORDER BY Map
+    """, params)
+    summary['Win Rate'] = summary['Wins'] / summary['Games']
+    return summary
+
+
+def round_summary(db_path, start, end, map_name="All"):
+    """
+    Same table as analytics.round_summary, as one grouped query.
+    """
+    where, params = _where(start, end, Map=map_name)
+    summary = _query(db_path, f"""
+        SELECT Map, {_OUTCOME_COUNTS},
+            AVG("Atk WR Derived") AS Raw_Atk_WR,
+            AVG("Def WR Derived") AS Raw_Def_WR
+        FROM score {where}
+        GROUP BY Map HAVING Map IS NOT NULL AND COUNT(Outcome) > 0 ORDER BY Map
+    """, params)
+    summary['Raw_Round_WR'] = (summary['Raw_Atk_WR'] + summary['Raw_Def_WR']) / 2
+    return summary
+
+
+def post_plant_table(db_path):
+    """
+    Same table as analytics.post_plant_table, as one grouped query.
+    """
+    return _query(db_path, """
+        SELECT Map, AVG(Atk_PP_Success) AS Atk_PP_Success, AVG(Def_PP_Success) AS Def_PP_Success
+        FROM score GROUP BY Map HAVING Map IS NOT NULL ORDER BY Map
+    """)
+
+
+def pistol_rates(db_path, start, end):
+    """
+    Same table as analytics.pistol_rates, as one grouped query.
+    """
+    where, params = _where(start, end)
+    grouped = _query(db_path, f"""
+        SELECT Map,
+            TOTAL("First Pistol" + "Second Pistol") AS Total_Pistols_Won,
+            COUNT(Map) * 2 AS Total_Pistols_Played
+        FROM score {where}
+        GROUP BY Map HAVING Map IS NOT NULL ORDER BY Map
+    """, params)
+    grouped['Pistol Win Rate (%)'] = (grouped['Total_Pistols_Won'] / grouped['Total_Pistols_Played']) * 100
+    return grouped.sort_values(by='Pistol Win Rate (%)', ascending=False)
+
+
+def second_round_conversions(db_path, start, end, map_name):
+    """
+    Same (win, loss) Conversion / Percentage frames as
+    analytics.second_round_conversions, counted in SQL over both halves.
+    """
+    where, params = _where(start, end, Map=map_name)
+    counts = _query(db_path, f"""
+        SELECT Conversion, COUNT(*) AS n FROM (
+            SELECT "Atk 2nd" AS Conversion FROM score {where}
+            UNION ALL
+            SELECT "Def 2nd" AS Conversion FROM score {where}
+        ) GROUP BY Conversion ORDER BY n DESC, Conversion
+    """, params * 2).set_index('Conversion')['n']
+
+    pies = []
+    for codes in (['WW', 'WL'], ['LL', 'LW']):
+        played = counts[counts.index.isin(codes)]
+        pies.append(pd.DataFrame({
+            'Conversion': played.index,
+            'Percentage': played.to_numpy() / played.sum() * 100 if len(played) else [],
+        }))
+    return tuple(pies)
+
+
+def player_agent_stats(db_path, player, start, end, map_name="All"):
+    """
+    Same table as analytics.player_agent_stats, as one grouped query.
+    """
+    where, params = _where(start, end, Player=player, **{'Column 1': map_name})
+    agent_stats = _query(db_path, f"""
+        SELECT Agent,
+            TOTAL(Rounds) AS Rounds, TOTAL(Kills) AS Kills, TOTAL(Deaths) AS Deaths,
+            TOTAL(Assists) AS Assists, AVG(ACS) AS ACS, TOTAL(FK) AS FK, TOTAL(Plants) AS Plants
+        FROM form {where}
+        GROUP BY Agent HAVING Agent IS NOT NULL ORDER BY Agent
+    """, params)
+
+    agent_stats['K/D Ratio'] = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
+    agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
+    return agent_stats
+
+
+def player_role_stats(db_path, player, start, end, map_name="All"):
+    """
+    Same table as analytics.player_role_stats, as one grouped query.
+    """
+    where, params = _where(start, end, Player=player, **{'Column 1': map_name})
+    agent_stats = _query(db_path, f"""
+        SELECT Agent,
+            TOTAL(Rounds) AS Rounds, TOTAL(Kills) AS Kills, TOTAL(Deaths) AS Deaths,
+            AVG(Multi_Kills) AS Multi_Kills, AVG(Assists) AS Assists, AVG(ACS) AS ACS,
+            TOTAL(FK) AS FK, AVG(FBSR) AS FBSR, AVG(FKPR) AS FKPR, AVG(KPR) AS KPR,
+            AVG(COALESCE(Atk_Entry, 0)) AS Atk_Entry, AVG(FD) AS FD, AVG(Anchor_Time) AS Anchor_Time
+        FROM form {where}
+        GROUP BY Agent HAVING Agent IS NOT NULL ORDER BY Agent
+    """, params)
+
+    agent_stats['K/D Ratio'] = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
+    agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
+    agent_stats['Role'] = agent_stats['Agent'].map(AGENT_ROLES)
+    return agent_stats
@@ -1,15 +1,23 @@
+import functools
 import streamlit as st
 import pandas as pd
-from PIL import Image
 import os
-import plotly.express as px
-import plotly.graph_objects as go
-from data_cleaner import clean_scrim_form
-import base64
+# plotly is imported inside figures.py's builders, so the login page and a
+# worker's cold start don't pay for it
+from data_loader import load_form, load_score, load_acs_view, load_rollup, range_version, shared_bytes, private_bytes, FORM_PATH, SCORE_PATH
+from compositions import shared_composition_index
+import analytics
+import figures
+import rollups
+import sql_backend
+import timings
+from asset_cache import background_data_uri, logo_image
 
 # Hardcoded login credentials 
 USERNAME = "admin"
 PASSWORD = "tyloo123"
+# Logins that see the ⏱️ Timings panel
+ADMINS = {USERNAME}
 
 # Login logic
 if "logged_in" not in st.session_state:
@@ -23,22 +31,28 @@ if not st.session_state.logged_in:
     if st.button("Login"):
         if username_input == USERNAME and password_input == PASSWORD:
             st.session_state.logged_in = True
+            st.session_state.username = username_input
             st.rerun()
         else:
             st.error("Incorrect username or password")
     st.stop()
 
-def get_base64_image(path):
-    with open(path, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
-
 st.set_page_config(page_title="Valorant Scrim Dashboard", layout="wide")
-encoded_bg = get_base64_image("wallp.png")
+
+# ⏱️ Timings: opt-in per admin session (toggle in the sidebar panel at the
+# bottom); named timers below only record while a rerun is being timed
+is_admin = st.session_state.get('username') in ADMINS
+timing_enabled = is_admin and st.session_state.get('show_timings', False)
+if timing_enabled:
+    timings.start()
+else:
+    timings.finish(None)
+# Downscaled and encoded once per process (see asset_cache.py)
+background_uri = background_data_uri()
 st.markdown(f"""
     <style>
     body {{
-        background-image: url("data:image/jpg;base64,{encoded_bg}");
+        background-image: url("{background_uri}");
         background-size: cover;
         background-position: center;
         background-attachment: fixed;
@@ -67,189 +81,265 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 st.title("Valorant Scrim Dashboard")
-st.image("tyloo_logo.png", width=100)
+st.image(logo_image(), width=100)
+
 
+# Each tab asks data_loader only for the columns it uses; with a Parquet store
+# (python data_cleaner.py --convert form.csv) only those columns are read from disk
+COMPOSITION_COLUMNS = ['Column 1', 'Agent', 'Result', 'Date']
 
+# Datasets are parsed once per file version and shared by every session (see
+# data_loader); each session only holds shallow copies, and filtering one copies
+# just the filtered rows
 # Load form.csv for overview and map comps
 try:
-    form_df = pd.read_csv("form.csv")
-    form_df = form_df[['Column 1', 'Agent', 'Result']].dropna().reset_index(drop=True)
+    with timings.timed("load.form"):
+        form_df = load_form(COMPOSITION_COLUMNS)
 except Exception as e:
     form_df = pd.DataFrame()
     st.warning(f"⚠️ Couldn't load form.csv: {e}")
 
 # Load cleaned_score.csv for Round Insights
 try:
-    score_df = pd.read_csv("cleaned_score.csv")
+    with timings.timed("load.score"):
+        score_df = load_score()
 except Exception as e:
     score_df = pd.DataFrame()
     st.warning(f"⚠️ Couldn't load cleaned_score.csv: {e}")
-# Load foracs.csv for beeswarm and heatmap
+# Map / Player / ACS / Agent / Date / Result view of form.csv for beeswarm and heatmap
 try:
-    foracs_df = pd.read_csv("foracs.csv")
+    with timings.timed("load.acs_view"):
+        acs_df = load_acs_view()
 except Exception as e:
-    foracs_df = pd.DataFrame()
-    st.warning(f"⚠️ Couldn't load foracs.csv: {e}")
+    acs_df = pd.DataFrame()
+    st.warning(f"⚠️ Couldn't load the ACS view of form.csv: {e}")
+
+# 🧠 Memoised summaries: pure computations live in analytics.py (raw rows) and
+# rollups.py (date-range reductions over the daily rollup cubes); these wrappers
+# are shared by every session, keyed on the dataset version plus the filter
+# values, and bounded (LRU, CACHE_ENTRIES per function) with a CACHE_TTL expiry.
+# Date-range queries key on range_version, so an append outside their range
+# (data_cleaner.py --append) leaves their entries valid. With SCRIM_DB set the
+# summaries are SQL queries against that SQLite store instead (sql_backend.py
+# has the same functions as rollups.py, taking the database path)
+CACHE_TTL = 600
+CACHE_ENTRIES = 256
+
+
+def memoised(func):
+    cached = st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_ENTRIES, show_spinner=False)(func)
+    name = "query." + func.__name__.removeprefix("cached_")
+
+    # Timed cache hit or miss: what the rerun actually waited for
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        with timings.timed(name):
+            return cached(*args, **kwargs)
+    return call
+
+
+def fragment(func):
+    # A fragment rerun skips the top of the script, so it times itself
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        if not timing_enabled or timings.active():
+            return func(*args, **kwargs)
+        timings.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_timings(timings.finish(func.__name__.removeprefix("render_")))
+    return st.fragment(run)
+
+
+def record_timings(rec):
+    if rec is None:
+        return
+    recent = st.session_state.setdefault('timing_history', [])
+    recent.append(rec)
+    del recent[:-timings.RECENT_RERUNS]
+    log_path = os.environ.get(timings.LOG_ENV)
+    if log_path:
+        timings.append_log(log_path, rec)
+
+
+# 🎛️ Filters: Streamlit drops a widget's state while its section isn't drawn, so
+# each filter's value is also kept under a plain session key and put back when
+# the section is shown again. Saved values the data no longer offers fall back
+# to the default
+def remember(key, default, options=None, bounds=None):
+    saved = f"saved_{key}"
+    if key not in st.session_state:
+        value = st.session_state.get(saved, default)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        if options is not None and not all(v in options for v in values):
+            value = default
+        if bounds is not None and not all(bounds[0] <= v <= bounds[1] for v in values):
+            value = default
+        st.session_state[key] = value
+    st.session_state[saved] = st.session_state[key]
+    return key
+
+
+def score_version(start=None, end=None):
+    return range_version(SCORE_PATH, start, end), sql_backend.database_version()
+
+
+def form_version(start=None, end=None):
+    return range_version(FORM_PATH, start, end), sql_backend.database_version()
+
+
+def summaries():
+    return sql_backend if sql_backend.database_path() else rollups
+
+
+def summary_source(path):
+    return sql_backend.database_path() or load_rollup(path)
+
+
+@memoised
+def cached_map_summary(version, start, end):
+    return summaries().map_summary(summary_source(SCORE_PATH), start, end)
+
+
+@memoised
+def cached_round_summary(version, map_name, start, end):
+    return summaries().round_summary(summary_source(SCORE_PATH), start, end, map_name)
+
+
+def round_rows(map_name, start, end):
+    # Not memoised: st.cache_data would hand every session its own unpickled
+    # copy of the rows, where filtering the shared frame costs only the filter
+    with timings.timed("query.round_rows"):
+        db_path = sql_backend.database_path()
+        if db_path:
+            return sql_backend.score_rows(db_path, start, end, map_name)
+        return analytics.filter_rows(load_score(), start, end, map_name)
+
+
+@memoised
+def cached_post_plant(version):
+    return summaries().post_plant_table(summary_source(SCORE_PATH))
+
+
+@memoised
+def cached_pistol_rates(version, start, end):
+    return summaries().pistol_rates(summary_source(SCORE_PATH), start, end)
+
+
+@memoised
+def cached_second_round(version, start, end, map_name):
+    return summaries().second_round_conversions(summary_source(SCORE_PATH), start, end, map_name)
+
+
+def composition_index(form_ver, score_ver):
+    # Built once per data version and only extended when scrim rows are
+    # appended (see compositions.py)
+    return shared_composition_index(load_form(COMPOSITION_COLUMNS), load_score(), form_ver, score_ver)
+
+
+@memoised
+def cached_composition_maps(form_ver, score_ver):
+    return composition_index(form_ver, score_ver).maps()
+
 
-tabs = st.tabs(["📊 Overview", "🧩 Map Composition Win Rates", "📈 Round Insights","🔫 Pistol Insights","🔢 Player Stats","🆚 Player Comparison"])
+@memoised
+def cached_composition_table(form_ver, score_ver, map_name):
+    return composition_index(form_ver, score_ver).table(map_name)
+
+
+@memoised
+def cached_agent_win_grid(version):
+    return analytics.agent_win_grid(load_acs_view())
+
+
+@memoised
+def cached_player_options(version):
+    # Players, maps and date bounds over rows whose date parsed, or None if there are none
+    player_df = load_form(['Player', 'Column 1', 'Date'])
+    dated = player_df[player_df['Date'].notna()]
+    if dated.empty:
+        return None
+    return (
+        sorted(dated['Player'].dropna().unique()),
+        sorted(dated['Column 1'].dropna().unique()),
+        dated['Date'].min().date(),
+        dated['Date'].max().date(),
+    )
+
+
+@memoised
+def cached_player_agent_stats(version, player, start, end, map_name):
+    return summaries().player_agent_stats(summary_source(FORM_PATH), player, start, end, map_name)
+
+
+@memoised
+def cached_player_role_stats(version, player, start, end, map_name):
+    return summaries().player_role_stats(summary_source(FORM_PATH), player, start, end, map_name)
+
+
+@memoised
+def cached_radar_inputs(version, player, start, end, map_name, role):
+    return analytics.radar_inputs(cached_player_role_stats(version, player, start, end, map_name), role)
+
+
+# Each section is a function and only the selected one runs (see SECTIONS at the
+# bottom), so an interaction never recomputes the other five sections
 
 # 📊 OVERVIEW TAB
-with tabs[0]:
+@fragment
+def render_overview():
     st.markdown("### 📅 Filter by Date Range")
 
     if score_df.empty:
         st.warning("⚠️ No score data loaded. Check that cleaned_score.csv exists in your repo.")
         st.stop()
 
-    score_df.columns = score_df.columns.str.strip()
-
     if 'Date' not in score_df.columns:
         st.error(f"'Date' column not found. Available columns: {score_df.columns.tolist()}")
         st.stop()
 
-    overview_dates = sorted(score_df['Date'].dropna().unique())
+    overview_dates = sorted(score_df['Date'].dropna().dt.date.unique())
     date_col1, date_col2 = st.columns(2)
-    start_date_overview = date_col1.selectbox("Start Date (Overview)", overview_dates, key="overview_start")
-    end_date_overview = date_col2.selectbox("End Date (Overview)", overview_dates, index=len(overview_dates)-1, key="overview_end")
+    start_date_overview = date_col1.selectbox(
+        "Start Date (Overview)", overview_dates, key=remember("overview_start", overview_dates[0], overview_dates))
+    end_date_overview = date_col2.selectbox(
+        "End Date (Overview)", overview_dates, key=remember("overview_end", overview_dates[-1], overview_dates))
 
-    filtered_score = score_df[(score_df['Date'] >= start_date_overview) & (score_df['Date'] <= end_date_overview)]
+    summary = cached_map_summary(score_version(start_date_overview, end_date_overview), start_date_overview, end_date_overview)
 
     st.subheader("Map Overview: Total Games, Wins, Draws, Losses, Win Rate")
-    if not filtered_score.empty:
-        summary = filtered_score.groupby('Map').agg(
-            Games=('Outcome', 'count'),
-            Wins=('Outcome', lambda x: (x.str.lower() == 'win').sum()),
-            Draws=('Outcome', lambda x: (x.str.lower() == 'draw').sum()),
-            Losses=('Outcome', lambda x: (x.str.lower() == 'loss').sum())
-        ).reset_index()
-        summary['Win Rate'] = summary['Wins'] / summary['Games']
-        st.dataframe(summary.sort_values(by='Map'), use_container_width=True)
+    if not summary.empty:
+        with timings.timed("emit.dataframe"):
+            st.dataframe(summary.sort_values(by='Map'), use_container_width=True)
         # 📊 Map Win Rate Horizontal Bar Chart
         st.markdown("### 🗺️ Map Win Rates")
 
-        winrate_df = summary[['Map', 'Win Rate']].dropna().copy()
-        winrate_df['Win Rate %'] = winrate_df['Win Rate'] * 100
-        winrate_df = winrate_df.sort_values(by='Win Rate %', ascending=False)
-
-        fig_map_wr = px.bar(
-            winrate_df,
-            x='Win Rate %',
-            y='Map',
-            orientation='h',
-            text=winrate_df['Win Rate %'].apply(lambda x: f"{x:.1f}%"),
-            title="Map Win Rates",
-            labels={'Win Rate %': 'Win Rate (%)', 'Map': 'Map'},
-            color='Win Rate %',
-            color_continuous_scale=['#8B0000', '#DC143C']
-        )
-
-        fig_map_wr.update_traces(
-            textposition='outside',
-            marker_line_color='#000000',
-            marker_line_width=1.2
-        )
-
-        fig_map_wr.update_layout(
-            plot_bgcolor='#000000',
-            paper_bgcolor='#000000',
-            font=dict(family='Inter', size=14, color='#DC143C'),
-            title_font=dict(size=20, color='#DC143C'),
-            yaxis=dict(
-                tickfont=dict(color='#ffffff'),
-                categoryorder='total ascending',
-                gridcolor='#333333'
-            ),
-            xaxis=dict(
-                title='Win Rate (%)',
-                title_font=dict(color='#DC143C'),
-                tickfont=dict(color='#ffffff'),
-                gridcolor='#333333',
-                range=[0, 100]
-            )
-        )
-
-        st.plotly_chart(fig_map_wr, use_container_width=True)
+        with timings.timed("figure.map_win_rates"):
+            fig_map_wr = figures.map_win_rates(summary)
+        with timings.timed("emit.plotly_chart"):
+            st.plotly_chart(fig_map_wr, use_container_width=True)
 
     else:
         st.info("No scrim data in this date range.")
 
 ### --- Composition Win Rate Chart (Styled like rib.gg) ---
 
-# This block should only be inside the Map Composition tab
-with tabs[1]:
+def render_map_compositions():
+    render_composition_win_rates()
+    render_agent_heatmap()
+
+
+@fragment
+def render_composition_win_rates():
     st.subheader("Top 5-agent Composition Win Rates by Map")
     if not form_df.empty:
-        valid_maps = []
-        for i in range(0, len(form_df) - 4, 5):
-            block = form_df.iloc[i:i+5]
-            if len(block) == 5 and block['Column 1'].nunique() == 1 and block['Result'].nunique() == 1:
-                valid_maps.append(block['Column 1'].iloc[0])
-
-        valid_maps = sorted(set(valid_maps))
-        selected_map = st.selectbox("Select a map:", valid_maps)
-
-        teams = []
-        filtered_dates = set(score_df['Date'])
-        for i in range(0, len(form_df) - 4, 5):
-            block = form_df.iloc[i:i+5]
-            map_match = block['Column 1'].iloc[0]
-            result_match = block['Result'].iloc[0]
-
-            if (
-                len(block) == 5 and
-                block['Column 1'].nunique() == 1 and
-                block['Result'].nunique() == 1 and
-                block['Column 1'].iloc[0] == selected_map
-            ):
-                match_filter = (
-                    (score_df['Map'] == map_match) &
-                    (score_df['Outcome'].str.lower() == result_match.lower()) &
-                    (score_df['Date'].isin(filtered_dates))
-                )
-                if not score_df[match_filter].empty:
-                    agents = tuple(sorted(block['Agent'].tolist()))
-                    teams.append({
-                        'Composition': agents,
-                        'Result': result_match
-                    })
-
-        df = pd.DataFrame(teams)
-        if not df.empty:
-            df['Win'] = df['Result'].apply(lambda x: 1 if x.lower() == 'win' else 0)
-            df['Draw'] = df['Result'].apply(lambda x: 1 if x.lower() == 'draw' else 0)
-            df['Loss'] = df['Result'].apply(lambda x: 1 if x.lower() == 'loss' else 0)
-            df['Game'] = 1
-
-            grouped = df.groupby('Composition').agg(
-                games=('Game', 'sum'),
-                wins=('Win', 'sum'),
-                draws=('Draw', 'sum'),
-                losses=('Loss', 'sum')
-            ).reset_index()
-
-            grouped['Win Rate %'] = grouped['wins'] / grouped['games'] * 100
-            grouped['Comp String'] = grouped['Composition'].apply(lambda x: '-'.join(x))
-            grouped = grouped.sort_values(by='Win Rate %', ascending=False).head(15)
-        else:
-            grouped = pd.DataFrame()
-
-        def get_agent_icon(agent_name):
-            path = f"assets/{agent_name}.png"
-            if os.path.exists(path):
-                return Image.open(path)
-            return None
-
-        # Add a column with the first agent's icon
-        if 'grouped' in dir() and not grouped.empty:
-            grouped['Win Rate %'] = grouped['wins'] / grouped['games'] * 100
-            grouped['Comp String'] = grouped['Composition'].apply(lambda x: '-'.join(x))
-            grouped['First Agent'] = grouped['Composition'].apply(lambda x: x[0])
-            grouped['Icon Path'] = grouped['First Agent'].apply(lambda agent: f"assets/{agent}.png" if os.path.exists(f"assets/{agent}.png") else None)
-            grouped = grouped.sort_values(by='Win Rate %', ascending=False).head(15)
-        # 👇 Add this directly below — no extra indentation
-        if not grouped.empty:
-            grouped['First Agent'] = grouped['Composition'].apply(lambda x: x[0])
-            grouped['Icon Path'] = grouped['First Agent'].apply(lambda agent: f"assets/{agent}.png" if os.path.exists(f"assets/{agent}.png") else None)
+        form_ver, score_ver = form_version(), score_version()
+        valid_maps = cached_composition_maps(form_ver, score_ver)
+        selected_map = st.selectbox(
+            "Select a map:", valid_maps, key=remember("composition_map", valid_maps[0] if valid_maps else None, valid_maps))
+
+        grouped = cached_composition_table(form_ver, score_ver, selected_map)
 
 # Agent Icons Display with Bar Chart (rib.gg style)
         if not grouped.empty:
@@ -316,205 +406,66 @@ with tabs[1]:
             
             st.markdown(f"### Top Compositions on {selected_map}")
             
-            # Calculate max width for bar scaling
-            max_win_rate = grouped['Win Rate %'].max()
-            
-            for idx, row in grouped.iterrows():
-                composition = row['Composition']
-                win_rate = row['Win Rate %']
-                games = row['games']
-                wins = row['wins']
-                losses = row['losses']
-                draws = row['draws']
-                
-                # Calculate bar width percentage (scale to fit remaining space)
-                bar_width_percent = (win_rate / max_win_rate * 80) if max_win_rate > 0 else 0
-                
-                # Create agent icons HTML
-                icons_html = ""
-                for agent in composition:
-                    icon_name = agent.lower().replace('/', '_').replace(' ', '_')
-                    icon_path = f"assets/agents/{icon_name}.png"
-                    
-                    if os.path.exists(icon_path):
-                        # Convert to base64 for HTML embedding
-                        import base64
-                        try:
-                            with open(icon_path, "rb") as img_file:
-                                img_data = base64.b64encode(img_file.read()).decode()
-                            icons_html += f'<img src="data:image/png;base64,{img_data}" class="agent-icon-img" title="{agent}" />'
-                        except:
-                            icons_html += f'<div class="agent-icon-img" style="background:#666;color:white;display:flex;align-items:center;justify-content:center;font-size:10px;" title="{agent}">{agent[:2]}</div>'
-                    else:
-                        icons_html += f'<div class="agent-icon-img" style="background:#666;color:white;display:flex;align-items:center;justify-content:center;font-size:10px;" title="{agent}">{agent[:2]}</div>'
-                
-                # Create the complete composition bar (rib.gg style)
-                composition_html = f"""
-                <div class="composition-container">
-                    <div class="composition-bar">
-                        <div class="bar-background" style="width: {bar_width_percent}%;"></div>
-                        <div class="agents-container">
-                            {icons_html}
-                        </div>
-                        <div class="win-rate-info">
-                            <div class="win-percentage">{win_rate:.1f}%</div>
-                            <div class="game-count">({games} games)</div>
-                        </div>
-                    </div>
-                </div>
-                """
-                
-                st.markdown(composition_html, unsafe_allow_html=True)
+            with timings.timed("figure.composition_html"):
+                bars_html = figures.composition_html(grouped)
+            with timings.timed("emit.composition_html"):
+                st.markdown(bars_html, unsafe_allow_html=True)
         else:
             st.info(f"No composition data available for {selected_map}")
     
-    # --- Win rates by agent by player (heatmap) ---
+
+
+# --- Win rates by agent by player (heatmap) ---
+def render_agent_heatmap():
     st.subheader("📊 Win Rate by Agent by Player")
-    if not foracs_df.empty and 'Result' in foracs_df.columns:
-        foracs_agg = foracs_df.groupby(['Player', 'Agent']).agg(
-            games=('Result', 'count'),
-            wins=('Result', lambda x: (x.str.strip().str.lower() == 'win').sum())
-        ).reset_index()
-        foracs_agg['Win Rate %'] = (foracs_agg['wins'] / foracs_agg['games'] * 100).round(1)
-        pivot = foracs_agg.pivot_table(index='Player', columns='Agent', values='Win Rate %', aggfunc='mean')
-        pivot_wins = foracs_agg.pivot_table(index='Player', columns='Agent', values='wins', aggfunc='sum')
-        pivot_games = foracs_agg.pivot_table(index='Player', columns='Agent', values='games', aggfunc='sum')
-        if not pivot.empty:
-            # Full grid: all players × all agents (not played = -1 for light grey)
-            all_players = sorted(foracs_df['Player'].dropna().unique())
-            all_agents = sorted(foracs_df['Agent'].dropna().unique())
-            pivot = pivot.reindex(index=all_players, columns=all_agents)
-            pivot_wins = pivot_wins.reindex(index=all_players, columns=all_agents)
-            pivot_games = pivot_games.reindex(index=all_players, columns=all_agents)
-            NOT_PLAYED = -1
-            z = pivot.values.copy()
-            z[pd.isna(z)] = NOT_PLAYED
-            z = z.astype(float)
-            # Build customdata: for hover - "Not played" or "Win Rate: X% (w/g)"
-            customdata = []
-            for player in all_players:
-                row = []
-                for agent in all_agents:
-                    g = pivot_games.loc[player, agent] if pd.notna(pivot_games.loc[player, agent]) else 0
-                    g = int(g)
-                    if g == 0:
-                        row.append("Not played")
-                    else:
-                        w = int(pivot_wins.loc[player, agent]) if pd.notna(pivot_wins.loc[player, agent]) else 0
-                        wr = pivot.loc[player, agent]
-                        wr = float(wr) if pd.notna(wr) else 0
-                        row.append(f"Win Rate: {wr:.0f}% ({w}/{g})")
-                customdata.append(row)
-            # Text: show % only where played
-            text = [[f"{v:.0f}%" if v >= 0 else "" for v in row] for row in z]
-            fig_heat = go.Figure(data=go.Heatmap(
-                z=z,
-                x=all_agents,
-                y=all_players,
-                customdata=customdata,
-                zmin=NOT_PLAYED,
-                zmax=100,
-                colorscale=[[0, '#9ca3af'], [0.01, '#dc2626'], [0.06, '#fef08a'], [0.36, '#86efac'], [0.66, '#22c55e'], [1, '#14532d']],
-                text=text,
-                texttemplate="%{text}",
-                textfont=dict(family='Rajdhani', size=12, color='white'),
-                hoverongaps=False,
-                hovertemplate="Player: %{y}<br>Agent: %{x}<br>%{customdata}<extra></extra>"
-            ))
-            fig_heat.update_layout(
-                title="Win Rate % by Player and Agent",
-                xaxis=dict(title='Agent', side='bottom', tickangle=-45, tickfont=dict(family='Rajdhani', color='#FDB913')),
-                yaxis=dict(title='Player', tickfont=dict(family='Rajdhani', color='#FDB913'), autorange='reversed'),
-                plot_bgcolor='#000000',
-                paper_bgcolor='#000000',
-                font=dict(family='Rajdhani', color='#FDB913'),
-                title_font=dict(size=18, color='#FDB913'),
-                margin=dict(l=80, r=40, t=60, b=120),
-                height=max(400, 48 * len(pivot.index) + 120),
-                width=max(400, 48 * len(pivot.columns) + 100)
-            )
-            st.plotly_chart(fig_heat, use_container_width=True)
+    if not acs_df.empty and 'Result' in acs_df.columns:
+        # Full grid: all players × all agents (analytics.agent_win_grid)
+        grid = cached_agent_win_grid(form_version())
+        if grid is not None:
+            pivot, pivot_wins, pivot_games = grid
+            with timings.timed("figure.agent_heatmap"):
+                fig_heat = figures.agent_heatmap(pivot, pivot_wins, pivot_games)
+            with timings.timed("emit.plotly_chart"):
+                st.plotly_chart(fig_heat, use_container_width=True)
         else:
             st.info("No player–agent combinations with data.")
     else:
-        st.info("No foracs data available for win rate by agent by player.")
+        st.info("No player ACS data available for win rate by agent by player.")
 
 # 📈 ROUND INSIGHTS TAB
-with tabs[2]:
+def render_round_insights():
+    render_round_summary()
+    render_post_plant()
+
+
+@fragment
+def render_round_summary():
     st.subheader("📈 Round Insights from cleaned_score.csv")
     if not score_df.empty:
         maps = sorted(score_df['Map'].dropna().unique())
-        dates = sorted(score_df['Date'].dropna().unique())
+        dates = sorted(score_df['Date'].dropna().dt.date.unique())
 
         col1, col2 = st.columns(2)
-        selected_map = col1.selectbox("Filter by Map", ["All"] + maps)
-        start_date = col1.selectbox("Start Date", dates, key="insight_start")
-        end_date = col2.selectbox("End Date", dates, index=len(dates)-1, key="insight_end")
-
-        filtered_df = score_df.copy()
-        if selected_map != "All":
-            filtered_df = filtered_df[filtered_df['Map'] == selected_map]
+        selected_map = col1.selectbox("Filter by Map", ["All"] + maps, key=remember("insight_map", "All", ["All"] + maps))
+        start_date = col1.selectbox("Start Date", dates, key=remember("insight_start", dates[0], dates))
+        end_date = col2.selectbox("End Date", dates, key=remember("insight_end", dates[-1], dates))
 
-        if start_date and end_date:
-            filtered_df = filtered_df[(filtered_df['Date'] >= start_date) & (filtered_df['Date'] <= end_date)]
+        filtered_df = round_rows(selected_map, start_date, end_date)
+        summary = cached_round_summary(score_version(start_date, end_date), selected_map, start_date, end_date)
 
-        # Derive Atk/Def WR based on Star Side
-        def extract_wr(row, side):
-            if pd.isna(row['Start']) or pd.isna(row['First Half WR']) or pd.isna(row['Second Half WR']):
-                return None
-            if side == 'Attack':
-                return row['First Half WR'] if row['Start'] == 'Attack' else row['Second Half WR']
-            elif side == 'Defence':
-                return row['First Half WR'] if row['Start'] == 'Defence' else row['Second Half WR']
-            return None
+        # 'Atk WR Derived' / 'Def WR Derived' are stored columns computed once
+        # at load from the start side (data_cleaner.derive_side_win_rates)
 
-        filtered_df['Atk WR Derived'] = filtered_df.apply(lambda row: extract_wr(row, 'Attack'), axis=1)
-        filtered_df['Def WR Derived'] = filtered_df.apply(lambda row: extract_wr(row, 'Defence'), axis=1)
-
-        st.dataframe(filtered_df, use_container_width=True)
+        with timings.timed("emit.dataframe"):
+            st.dataframe(filtered_df, use_container_width=True)
 
         st.markdown("### 🔍 Summary Stats")
 
-        agg_dict = {
-            'Games': ('Outcome', 'count'),
-            'Wins': ('Outcome', lambda x: (x.str.lower() == 'win').sum()),
-            'Draws': ('Outcome', lambda x: (x.str.lower() == 'draw').sum()),
-            'Losses': ('Outcome', lambda x: (x.str.lower() == 'loss').sum()),
-            'Avg_Atk_WR': ('Atk WR Derived', lambda x: pd.to_numeric(x.astype(str).str.replace('%','', regex=False), errors='coerce').mean()),
-            'Avg_Def_WR': ('Def WR Derived', lambda x: pd.to_numeric(x.astype(str).str.replace('%','', regex=False), errors='coerce').mean()),
-
-        }
-
-        if 'Atk PP %' in filtered_df.columns:
-            agg_dict['Atk_PP_Success'] = (
-                'Atk PP %',
-                lambda x: pd.to_numeric(x.fillna('0').str.replace('%', ''), errors='coerce').mean()
-            )
-
-        if 'Def PP %' in filtered_df.columns:
-            agg_dict['Def_PP_Success'] = (
-                'Def PP %',
-                lambda x: pd.to_numeric(x.fillna('0').str.replace('%', ''), errors='coerce').mean()
-            )
-
-
-        summary = filtered_df.groupby('Map').agg(**agg_dict).reset_index()
-        # Calculate Round Win Rate using (Atk + Def) / 2
-        summary['Raw_Round_WR'] = (summary['Avg_Atk_WR'] + summary['Avg_Def_WR']) / 2
-        summary['Round WR'] = summary['Raw_Round_WR'].apply(lambda x: f"{x * 100:.1f}%" if pd.notnull(x) else "-")
-
-
-        # Optional: Format WRs as percentages
-        # Save raw numeric values for chart use (before formatting to %)
-        summary['Raw_Atk_WR'] = summary['Avg_Atk_WR']
-        summary['Raw_Def_WR'] = summary['Avg_Def_WR']
-        summary['Raw_Round_WR'] = (summary['Raw_Atk_WR'] + summary['Raw_Def_WR']) / 2
-        summary['Round WR'] = summary['Raw_Round_WR'].apply(lambda x: f"{x * 100:.1f}%" if pd.notnull(x) else "-")
-
-
-
-        summary['Avg_Atk_WR'] = summary['Avg_Atk_WR'].apply(lambda x: f"{x * 100:.1f}%" if pd.notnull(x) else "-")
-        summary['Avg_Def_WR'] = summary['Avg_Def_WR'].apply(lambda x: f"{x * 100:.1f}%" if pd.notnull(x) else "-")
+        # Format WRs as percentages; Raw_* stay numeric for the chart below
+        format_wr = lambda x: f"{x * 100:.1f}%" if pd.notnull(x) else "-"
+        summary['Avg_Atk_WR'] = summary['Raw_Atk_WR'].apply(format_wr)
+        summary['Avg_Def_WR'] = summary['Raw_Def_WR'].apply(format_wr)
+        summary['Round WR'] = summary['Raw_Round_WR'].apply(format_wr)
         display_cols = ['Map', 'Games', 'Wins', 'Draws', 'Losses', 'Avg_Atk_WR', 'Avg_Def_WR','Round WR']
 
         def highlight_win_rates(val, threshold_low=40, threshold_high=60):
@@ -539,355 +490,147 @@ with tabs[2]:
 
         # Only show selected columns in the summary table (hide raw WRs)
         display_cols = ['Map', 'Games', 'Wins', 'Draws', 'Losses', 'Avg_Atk_WR', 'Avg_Def_WR','Round WR']
-        st.dataframe(styled_df, use_container_width=True)
+        with timings.timed("emit.dataframe"):
+            st.dataframe(styled_df, use_container_width=True)
 
         # Visualize Attack vs Defense Win Rates
-        # Prepare data
-        plot_df = summary[['Map', 'Raw_Atk_WR', 'Raw_Def_WR']].copy()
-        plot_df.rename(columns={'Raw_Atk_WR': 'Attack', 'Raw_Def_WR': 'Defense'}, inplace=True)
-        plot_df['Attack'] *= 100
-        plot_df['Defense'] *= 100
-
-        # Melt for plotting
-        plot_df = plot_df.melt(id_vars='Map', var_name='Side', value_name='Win Rate (%)')
-        plot_df['Map'] = pd.Categorical(plot_df['Map'], categories=plot_df.groupby('Map')['Win Rate (%)'].mean().sort_values(ascending=False).index, ordered=True)
-
-        # Wolves color map
-        color_map = {
-            'Attack': '#DC143C',   # Red
-            'Defense': '#ffffff'   # White
-        }
-
-        fig = px.bar(
-            plot_df,
-            x='Map',
-            y='Win Rate (%)',
-            color='Side',
-            color_discrete_map=color_map,
-            barmode='group',
-            text=plot_df['Win Rate (%)'].apply(lambda x: f"{x:.1f}%"),
-            title="Attack vs Defense Win Rates by Map"
-        )
-
-        fig.update_traces(
-            textposition='outside',
-            marker_line_color='#333333',
-            marker_line_width=1.2,
-            width=0.4
-        )
-
-        fig.update_layout(
-            plot_bgcolor='#000000',
-            paper_bgcolor='#000000',
-            font=dict(color='#DC143C', family='Inter'),
-            title_font=dict(color='#DC143C', size=20),
-            legend_title_text='Side',
-            xaxis=dict(tickangle=-25, gridcolor='#333333'),
-            yaxis=dict(range=[0, 100], gridcolor='#333333')
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-        #--- Post-Plant Success Rate Bar Chart ---
-        if 'Atk_PP_Success' in score_df.columns and 'Def_PP_Success' in score_df.columns:
-            st.markdown("### 📊 Post-Plant Success Rate by Map")
-
-            # Fresh aggregation directly from original score_df
-            pp_df = score_df.groupby('Map').agg({
-                'Atk_PP_Success': lambda x: pd.to_numeric(x.astype(str).str.replace('%','', regex=False), errors='coerce').mean(),
-                'Def_PP_Success': lambda x: pd.to_numeric(x.astype(str).str.replace('%','', regex=False), errors='coerce').mean()
-            }).reset_index()
-
-            label_map = {
-                "Atk_PP_Success": "Post Plant",
-                "Def_PP_Success": "Retakes"
-            }
-
-            sort_label = st.selectbox("Sort by", list(label_map.values()), index=0)
-            sort_col = [k for k, v in label_map.items() if v == sort_label][0]
-            sort_order = st.radio("Order", ["Descending", "Ascending"], horizontal=True)
-            ascending = sort_order == "Ascending"
-
-            # Optional: convert to 0–100 range if needed
-            if pp_df['Atk_PP_Success'].max() <= 1.0:
-                pp_df['Atk_PP_Success'] *= 100
-                pp_df['Def_PP_Success'] *= 100
-
-            pp_df = pp_df.sort_values(by=sort_col, ascending=ascending)
-            pp_df['Map'] = pd.Categorical(pp_df['Map'], categories=pp_df['Map'], ordered=True)
-
-            pp_df.rename(columns=label_map, inplace=True)
-            pp_df_long = pp_df.melt(id_vars='Map', var_name='Side', value_name='Post-Plant Success (%)')
-
-            fig_pp = px.bar(
-                pp_df_long,
-                x='Map',
-                y='Post-Plant Success (%)',
-                color='Side',
-                barmode='stack',
-                text=pp_df_long['Post-Plant Success (%)'].apply(lambda x: f"{x:.1f}%"),
-                title="Post-Plant Success Rate (Stacked Atk + Def)",
-                color_discrete_map={
-                    'Post Plant': '#DC143C',
-                    'Retakes': '#ffffff'
-                }
-            )
-
-            fig_pp.update_traces(
-                textposition='inside',
-                marker_line_color='#333333',
-                marker_line_width=1.2
-            )
-
-            fig_pp.update_layout(
-                plot_bgcolor='#000000',
-                paper_bgcolor='#000000',
-                font=dict(family='Inter, sans-serif', size=14, color='#DC143C'),
-                title_font=dict(size=20, color='#DC143C'),
-                xaxis=dict(
-                    title='Map',
-                    title_font=dict(size=16, color='#DC143C'),
-                    tickfont=dict(size=14, color='#ffffff'),
-                    tickangle=-25,
-                    gridcolor='#333333'
-                ),
-                yaxis=dict(
-                    title='Post-Plant Success (%)',
-                    title_font=dict(size=16, color='#DC143C'),
-                    tickfont=dict(size=14, color='#ffffff'),
-                    gridcolor='#333333',
-                    range=[0, 100]
-                ),
-                legend=dict(
-                    font=dict(size=13, color='#ffffff')
-                )
-            )
-
+        with timings.timed("figure.side_win_rates"):
+            fig = figures.side_win_rates(summary)
+        with timings.timed("emit.plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+
+
+# Sort controls only redraw this chart, not the Round Insights tables above
+@fragment
+def render_post_plant():
+    #--- Post-Plant Success Rate Bar Chart ---
+    if not score_df.empty and 'Atk_PP_Success' in score_df.columns and 'Def_PP_Success' in score_df.columns:
+        st.markdown("### 📊 Post-Plant Success Rate by Map")
+
+        # Fresh aggregation over all of score_df; post-plant columns are
+        # floats in the 0-100 percent unit (data_cleaner.SCHEMA)
+        pp_df = cached_post_plant(score_version())
+
+        label_map = figures.POST_PLANT_LABELS
+        sort_label = st.selectbox("Sort by", list(label_map.values()), key=remember("post_plant_sort", "Post Plant"))
+        sort_col = [k for k, v in label_map.items() if v == sort_label][0]
+        sort_order = st.radio("Order", ["Descending", "Ascending"], horizontal=True,
+                              key=remember("post_plant_order", "Descending"))
+
+        with timings.timed("figure.post_plant"):
+            fig_pp = figures.post_plant(pp_df, sort_col, ascending=sort_order == "Ascending")
+        with timings.timed("emit.plotly_chart"):
             st.plotly_chart(fig_pp, use_container_width=True)
 
 
-
-from datetime import datetime
-
-from datetime import datetime
-
-# 📊 GRAPH INSIGHTS TAB
-with tabs[3]:
+# 🔫 PISTOL INSIGHTS TAB
+@fragment
+def render_pistol_insights():
     st.subheader("🔫 Pistol Round Win Rate by Map")
 
     if not score_df.empty:
-        # Ensure date column is in datetime format
-        score_df['Date'] = pd.to_datetime(score_df['Date'], errors='coerce')
-
         # Date filter
         min_date = score_df['Date'].min()
         max_date = score_df['Date'].max()
 
         start_date, end_date = st.date_input(
             "Select Date Range",
-            value=(min_date, max_date),
             min_value=min_date,
-            max_value=max_date
+            max_value=max_date,
+            key=remember("pistol_dates", (min_date.date(), max_date.date()), bounds=(min_date.date(), max_date.date()))
         )
 
-        # Filter dataframe by date range
-        filtered_df = score_df[(score_df['Date'] >= pd.to_datetime(start_date)) & (score_df['Date'] <= pd.to_datetime(end_date))]
+        # Pistol stats for the date range
+        grouped = cached_pistol_rates(score_version(start_date, end_date), start_date, end_date)
+
+        # Plotly bar chart
+        with timings.timed("figure.pistol_rates"):
+            fig_pistol = figures.pistol_rates(grouped)
+        with timings.timed("emit.plotly_chart"):
+            st.plotly_chart(fig_pistol, use_container_width=True)
+
+        # --- 2nd Round Conversion Pie Charts (WW/WL and LL/LW) ---
+        # Own fragment: picking a map only redraws the pies
+        render_second_round_conversions(sorted(grouped['Map'].dropna()), start_date, end_date)
+
+    else:
+         st.info("No data available for pistol or 2nd round conversion insights.")
 
-        # Calculate pistol stats
-        filtered_df['Total Pistols Won'] = filtered_df['First Pistol'] + filtered_df['Second Pistol']
-        grouped = filtered_df.groupby('Map').agg(
-            Total_Pistols_Won=('Total Pistols Won', 'sum'),
-            Total_Pistols_Played=('Map', 'count')
-        ).reset_index()
 
-        grouped['Total_Pistols_Played'] *= 2  # 2 pistol rounds per map
-        grouped['Pistol Win Rate (%)'] = (grouped['Total_Pistols_Won'] / grouped['Total_Pistols_Played']) * 100
+@fragment
+def render_second_round_conversions(map_list, start_date, end_date):
+    st.markdown("### 🍰 2nd Round Outcomes by Map")
 
-        grouped = grouped.sort_values(by='Pistol Win Rate (%)', ascending=False)
+    if 'Atk 2nd' in score_df.columns and 'Def 2nd' in score_df.columns:
 
-        # Plotly bar chart
-        fig_pistol = px.bar(
-            grouped,
-            x='Map',
-            y='Pistol Win Rate (%)',
-            text=grouped['Pistol Win Rate (%)'].apply(lambda x: f"{x:.1f}%"),
-            color='Pistol Win Rate (%)',
-            color_continuous_scale=['#8B0000', '#DC143C'],
-            title="Pistol Win Rates by Map"
-        )
+         selected_map = st.selectbox("Select a map to view 2nd round breakdown:", map_list,
+                                     key=remember("second_round_map", map_list[0] if map_list else None, map_list))
 
-        fig_pistol.update_traces(
-            textposition='outside',
-            marker_line_color='#000000',
-            marker_line_width=1.2
-        )
+         pie_data_win, pie_data_loss = cached_second_round(score_version(start_date, end_date), start_date, end_date, selected_map)
 
-        fig_pistol.update_layout(
-            plot_bgcolor='#000000',
-            paper_bgcolor='#000000',
-            font=dict(family='Inter', size=14, color='#DC143C'),
-            title_font=dict(size=20, color='#DC143C'),
-            xaxis=dict(tickfont=dict(color='#ffffff'), gridcolor='#333333'),
-            yaxis=dict(range=[0, 100], title='Win Rate (%)', title_font=dict(color='#DC143C'), tickfont=dict(color='#ffffff'), gridcolor='#333333')
-        )
+         col1, col2 = st.columns(2)
 
-        st.plotly_chart(fig_pistol, use_container_width=True)
+         with col1:
+             st.markdown("#### 🔁 After Winning Pistol (WW/WL)")
 
-        # --- 2nd Round Conversion Pie Charts (WW/WL and LL/LW) ---
-        # --- 2nd Round Conversion Pie Charts (WW/WL and LL/LW) ---
-        st.markdown("### 🍰 2nd Round Outcomes by Map")
-
-        if 'Atk 2nd' in filtered_df.columns and 'Def 2nd' in filtered_df.columns:
-
-             conversion_data = pd.concat([
-                 filtered_df[['Map', 'Atk 2nd']].rename(columns={'Atk 2nd': 'Conversion'}),
-                 filtered_df[['Map', 'Def 2nd']].rename(columns={'Def 2nd': 'Conversion'})
-             ])
-
-             map_list = conversion_data['Map'].dropna().unique()
-             selected_map = st.selectbox("Select a map to view 2nd round breakdown:", sorted(map_list))
-
-             map_conversions = conversion_data[conversion_data['Map'] == selected_map]
-
-             col1, col2 = st.columns(2)
-
-             with col1:
-                 st.markdown("#### 🔁 After Winning Pistol (WW/WL)")
-                 filtered_win = map_conversions[map_conversions['Conversion'].isin(['WW', 'WL'])]
-
-                 if filtered_win.empty:
-                     st.info("No conversion attempts found for pistol round wins on this map.")
-                 else:
-                     pie_data_win = filtered_win['Conversion'].value_counts(normalize=True).reset_index()
-                     pie_data_win.columns = ['Conversion', 'Percentage']
-                     pie_data_win['Percentage'] *= 100
-
-                     fig_pie_win = px.pie(
-                         pie_data_win,
-                         names='Conversion',
-                         values='Percentage',
-                         title=f"Pistol Conversion - {selected_map}",
-                         color='Conversion',
-                        color_discrete_map={
-                            'WW': '#DC143C',
-                            'WL': '#666666'
-                        },
-                         hole=0.4
-                     )
-
-                     fig_pie_win.update_traces(
-                         textinfo='label+percent',
-                         marker_line_color='#000000',
-                         marker_line_width=1.5
-                     )
-
-                     fig_pie_win.update_layout(
-                         plot_bgcolor='#000000',
-                         paper_bgcolor='#000000',
-                        font=dict(family='Inter', size=14, color='#DC143C'),
-                        title_font=dict(size=18, color='#DC143C'),
-                         legend=dict(font=dict(color='#ffffff'))
-                     )
+             if pie_data_win.empty:
+                 st.info("No conversion attempts found for pistol round wins on this map.")
+             else:
 
+                 with timings.timed("figure.conversion_pie"):
+                     fig_pie_win = figures.conversion_pie(pie_data_win, selected_map)
+                 with timings.timed("emit.plotly_chart"):
                      st.plotly_chart(fig_pie_win, use_container_width=True)
 
-             with col2:
-                 st.markdown("#### 🔁 After Losing Pistol (LL/LW)")
-                 filtered_loss = map_conversions[map_conversions['Conversion'].isin(['LL', 'LW'])]
-
-                 if filtered_loss.empty:
-                     st.info("No eco round outcomes found for pistol round losses on this map.")
-                 else:
-                     pie_data_loss = filtered_loss['Conversion'].value_counts(normalize=True).reset_index()
-                     pie_data_loss.columns = ['Conversion', 'Percentage']
-                     pie_data_loss['Percentage'] *= 100
-
-                     fig_pie_loss = px.pie(
-                         pie_data_loss,
-                         names='Conversion',
-                         values='Percentage',
-                         title=f"Eco Round Outcomes - {selected_map}",
-                         color='Conversion',
-                         color_discrete_map={
-                             'LL': '#444444',
-                             'LW': '#3b82f6'
-                         },
-                         hole=0.4
-                     )
-
-                     fig_pie_loss.update_traces(
-                         textinfo='label+percent',
-                         marker_line_color='#000000',
-                         marker_line_width=1.5
-                     )
-
-                     fig_pie_loss.update_layout(
-                         plot_bgcolor='#000000',
-                         paper_bgcolor='#000000',
-                        font=dict(family='Inter', size=14, color='#DC143C'),
-                        title_font=dict(size=18, color='#DC143C'),
-                         legend=dict(font=dict(color='#ffffff'))
-                     )
+         with col2:
+             st.markdown("#### 🔁 After Losing Pistol (LL/LW)")
 
-                     st.plotly_chart(fig_pie_loss, use_container_width=True)
+             if pie_data_loss.empty:
+                 st.info("No eco round outcomes found for pistol round losses on this map.")
+             else:
 
-    else:
-         st.info("No data available for pistol or 2nd round conversion insights.")
+                 with timings.timed("figure.eco_pie"):
+                     fig_pie_loss = figures.eco_pie(pie_data_loss, selected_map)
+                 with timings.timed("emit.plotly_chart"):
+                     st.plotly_chart(fig_pie_loss, use_container_width=True)
 
 
 ## 🔢 PLAYER STATS TAB
-with tabs[4]:
+def render_player_stats():
+    render_player_agent_stats()
+    render_acs_beeswarm()
+
+
+@fragment
+def render_player_agent_stats():
     st.subheader("🧑‍💼 Player Agent Stats")
 
     try:
-        player_df = pd.read_csv("form.csv")
+        player_options = cached_player_options(form_version())
     except Exception as e:
         st.warning(f"Could not load player data: {e}")
-        player_df = pd.DataFrame()
-
-    if not player_df.empty:
-        player_df['Date'] = pd.to_datetime(player_df['Date'], errors='coerce')
-        player_df = player_df.dropna(subset=['Date'])
-
-        all_players = sorted(player_df['Player'].dropna().unique())
-        all_maps = sorted(player_df['Column 1'].dropna().unique())
+        player_options = None
 
-        min_date = player_df['Date'].min().date()
-        max_date = player_df['Date'].max().date()
+    if player_options:
+        all_players, all_maps, min_date, max_date = player_options
 
         col1, col2 = st.columns(2)
-        selected_player = col1.selectbox("Select a player:", all_players)
-        start_date = col1.date_input("Start date:", min_value=min_date, max_value=max_date, value=min_date)
-        end_date = col2.date_input("End date:", min_value=min_date, max_value=max_date, value=max_date)
-        selected_map = col2.selectbox("Filter by Map:", ["All"] + all_maps)
-
-        filtered = player_df[
-            (player_df['Player'] == selected_player) &
-            (player_df['Date'].dt.date >= start_date) &
-            (player_df['Date'].dt.date <= end_date)
-        ]
-
-        if selected_map != "All":
-            filtered = filtered[filtered['Column 1'] == selected_map]
-
-        if not filtered.empty:
-            agent_stats = filtered.groupby('Agent').agg(
-                Rounds=('Rounds', 'sum'),
-                Kills=('Kills', 'sum'),
-                Deaths=('Deaths', 'sum'),
-                Assists=('Assists', 'sum'),
-                ACS=('ACS', 'mean'),
-                FK=('FK', 'sum'),
-                Plants=('Plants', 'sum')
-            ).reset_index()
-
-            agent_stats['K/D Ratio'] = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
-            agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
+        selected_player = col1.selectbox(
+            "Select a player:", all_players, key=remember("stats_player", all_players[0], all_players))
+        start_date = col1.date_input("Start date:", min_value=min_date, max_value=max_date,
+                                     key=remember("stats_start", min_date, bounds=(min_date, max_date)))
+        end_date = col2.date_input("End date:", min_value=min_date, max_value=max_date,
+                                   key=remember("stats_end", max_date, bounds=(min_date, max_date)))
+        selected_map = col2.selectbox("Filter by Map:", ["All"] + all_maps, key=remember("stats_map", "All", ["All"] + all_maps))
 
+        agent_stats = cached_player_agent_stats(form_version(start_date, end_date), selected_player, start_date, end_date, selected_map)
+
+        if not agent_stats.empty:
             display_df = agent_stats.round(2)[['Agent', 'Rounds', 'Kills', 'Deaths', 'Assists', 'ACS', 'FK', 'Plants', 'K/D Ratio', 'K+A per Round']]
 
             st.markdown(f"### 🔍 Agent Performance for {selected_player} from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
-            st.dataframe(display_df, use_container_width=True)
+            with timings.timed("emit.dataframe"):
+                st.dataframe(display_df, use_container_width=True)
 
         else:
             st.info("No data for this player in the selected filters.")
@@ -895,17 +638,16 @@ with tabs[4]:
     else:
         st.warning("No player stats found in form.csv")
 
-     # 🐝 PLAYER ACS BEESWARM PLOT
-    with st.expander("🐝 Player ACS Beeswarm Plot"):
-        import seaborn as sns
-        import matplotlib.pyplot as plt
 
+# 🐝 PLAYER ACS BEESWARM PLOT
+@fragment
+def render_acs_beeswarm():
+    with st.expander("🐝 Player ACS Beeswarm Plot"):
         st.subheader("🐝 Player ACS Beeswarm Plot")
 
-        # Clean + convert
-        df = foracs_df.copy()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df['ACS'] = pd.to_numeric(df['ACS'], errors='coerce')
+        # Date and ACS are already typed by data_loader; filter the shared frame
+        # in place and only convert the filtered rows' labels (below)
+        df = acs_df
 
         players = sorted(df['Player'].dropna().unique())
         agents = sorted(df['Agent'].dropna().unique())
@@ -915,327 +657,65 @@ with tabs[4]:
 
         # Filters
         col1, col2 = st.columns(2)
-        selected_player = col1.selectbox("Select Player", players)
-        selected_agents = col2.multiselect("Filter by Agent(s)", agents, default=agents)
-        selected_maps = st.multiselect("Filter by Map(s)", maps, default=maps)
+        selected_player = col1.selectbox("Select Player", players, key=remember("acs_player", players[0], players))
+        selected_agents = col2.multiselect("Filter by Agent(s)", agents, key=remember("acs_agents", agents, agents))
+        selected_maps = st.multiselect("Filter by Map(s)", maps, key=remember("acs_maps", maps, maps))
 
-        start_date = st.date_input("Start Date", value=min(dates), min_value=min(dates), max_value=max(dates))
-        end_date = st.date_input("End Date", value=max(dates), min_value=min(dates), max_value=max(dates))
+        start_date = st.date_input("Start Date", min_value=dates[0], max_value=dates[-1],
+                                   key=remember("acs_start", dates[0], bounds=(dates[0], dates[-1])))
+        end_date = st.date_input("End Date", min_value=dates[0], max_value=dates[-1],
+                                 key=remember("acs_end", dates[-1], bounds=(dates[0], dates[-1])))
 
 
         # Filter the data
-        filtered_df = df[
-            (df['Player'] == selected_player) &
-            (df['Agent'].isin(selected_agents)) &
-            (df['Map'].isin(selected_maps)) &
-            (df['Date'].dt.date >= start_date) &
-            (df['Date'].dt.date <= end_date)
-        ]
+        filtered_df = analytics.acs_rows(df, selected_player, selected_agents, selected_maps, start_date, end_date)
+        # Plain labels so the legend only lists the agents actually in the filtered rows
+        filtered_df = filtered_df.astype({'Player': str, 'Agent': str, 'Map': str})
 
         if not filtered_df.empty:
-            avg_acs = filtered_df['ACS'].mean()
-
-            fig, ax = plt.subplots(figsize=(10, 5))
-            fig.patch.set_facecolor('#000000')
-            ax.set_facecolor('#000000')
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color('#ffffff')
-            ax.spines['bottom'].set_color('#ffffff')
-
-            palette = sns.color_palette("husl", len(filtered_df['Agent'].unique()))
-            sns.swarmplot(data=filtered_df, x='Map', y='ACS', hue='Agent', palette=palette, ax=ax)
-            ax.axhline(avg_acs, color='#DC143C', linestyle='--', linewidth=1.5)
-            ax.text(x=0.5, y=avg_acs + 2, s=f"Avg ACS: {avg_acs:.1f}", color='#DC143C', fontsize=10, ha='left')
-
-            ax.set_title(f"{selected_player}'s ACS by Agent & Map", color='#DC143C', fontsize=14)
-            ax.set_ylabel("ACS", color='white')
-            ax.set_xlabel("Map", color='white')
-            ax.tick_params(colors='white')
-            ax.legend(title="Agent", loc='best', facecolor='#1a1a1a', labelcolor='white', title_fontsize=10, fontsize=9)
-
-            st.pyplot(fig)
+            with timings.timed("figure.beeswarm"):
+                fig_swarm = figures.beeswarm(filtered_df, selected_player)
+            with timings.timed("emit.plotly_chart"):
+                st.plotly_chart(fig_swarm, use_container_width=True)
         else:
             st.info("No ACS data for selected filters.")
 
 
-# --- Post-Plant Success Rate Bar Chart ---
-
-if 'Atk_PP_Success' in summary.columns and 'Def_PP_Success' in summary.columns:
-
-    st.markdown("### 📊 Post-Plant Success Rate by Map")
-
-    label_map = {
-        "Atk_PP_Success": "Post Plant",
-        "Def_PP_Success": "Retakes"
-    }
-
-    sort_label = st.selectbox("Sort by", list(label_map.values()), index=0)
-    sort_col = [k for k, v in label_map.items() if v == sort_label][0]
-    sort_order = st.radio("Order", ["Descending", "Ascending"], horizontal=True)
-    ascending = sort_order == "Ascending"
-
-    pp_df = summary[['Map', 'Atk_PP_Success', 'Def_PP_Success']].copy()
-    pp_df = pp_df.fillna(0)
-
-    pp_df['Atk_PP_Success'] = pd.to_numeric(pp_df['Atk_PP_Success'], errors='coerce')
-    pp_df['Def_PP_Success'] = pd.to_numeric(pp_df['Def_PP_Success'], errors='coerce')
-    if pp_df['Atk_PP_Success'].max() <= 1.0:
-        pp_df['Atk_PP_Success'] *= 100
-        pp_df['Def_PP_Success'] *= 100
-
-    # Sort before renaming columns
-    pp_df = pp_df.sort_values(by=sort_col, ascending=ascending)
-    pp_df['Map'] = pd.Categorical(pp_df['Map'], categories=pp_df['Map'], ordered=True)
-
-    # Rename for nicer legend labels
-    pp_df.rename(columns=label_map, inplace=True)
-
-    pp_df_long = pp_df.melt(id_vars='Map', var_name='Side', value_name='Post-Plant Success (%)')
-
-    # Plot
-    fig_pp = px.bar(
-        pp_df_long,
-        x='Map',
-        y='Post-Plant Success (%)',
-        color='Side',
-        barmode='stack',
-        text=pp_df_long['Post-Plant Success (%)'].apply(lambda x: f"{x:.1f}%"),
-        title="Post-Plant Success Rate (Stacked Atk + Def)",
-        color_discrete_map={
-            'Post Plant': '#DC143C',
-            'Retakes': '#ffffff'
-        }
-    )
-
-    fig_pp.update_traces(
-        textposition='inside',
-        marker_line_color='#333333',
-        marker_line_width=1.2
-    )
-
-    fig_pp.update_layout(
-        plot_bgcolor='#000000',
-        paper_bgcolor='#000000',
-        font=dict(family='Inter, sans-serif', size=14, color='#DC143C'),
-        title_font=dict(size=20, color='#DC143C'),
-        xaxis=dict(
-            title='Map',
-            title_font=dict(size=16, color='#DC143C'),
-            tickfont=dict(size=14, color='#ffffff'),
-            tickangle=-25,
-            gridcolor='#333333'
-        ),
-        yaxis=dict(
-            title='Post-Plant Success (%)',
-            title_font=dict(size=16, color='#DC143C'),
-            tickfont=dict(size=14, color='#ffffff'),
-            gridcolor='#333333',
-            range=[0, 100]
-        ),
-        legend=dict(
-            font=dict(size=13, color='#ffffff')
-        )
-    )
-
-    st.plotly_chart(fig_pp, use_container_width=True)
-
 # 📊 PLAYER COMPARISON TAB
-with tabs[5]:
+@fragment
+def render_player_comparison():
     st.subheader("🎚 Player vs VCT Benchmark Comparison")
 
     try:
-        player_df = pd.read_csv("form.csv")
+        player_options = cached_player_options(form_version())
     except Exception as e:
         st.warning(f"Could not load player data: {e}")
-        player_df = pd.DataFrame()
-
-    if not player_df.empty:
-        # Convert and filter dates
-        player_df['Date'] = pd.to_datetime(player_df['Date'], errors='coerce')
-        player_df = player_df.dropna(subset=['Date'])
+        player_options = None
 
-        all_players = sorted(player_df['Player'].dropna().unique())
-        all_maps = sorted(player_df['Column 1'].dropna().unique())
-
-        min_date = player_df['Date'].min().date()
-        max_date = player_df['Date'].max().date()
+    if player_options:
+        all_players, all_maps, min_date, max_date = player_options
 
         col1, col2 = st.columns(2)
-        selected_player = col1.selectbox("Select a player:", all_players, key='compare_player')
-        start_date = col1.date_input("Start date:", value=min_date, min_value=min_date, max_value=max_date, key='compare_start')
-        end_date = col2.date_input("End date:", value=max_date, min_value=min_date, max_value=max_date, key='compare_end')
-        selected_map = col2.selectbox("Filter by Map:", ["All"] + all_maps, key='compare_map')
-
-        # Agent to role mapping
-        agent_roles = {
-            'Jett': 'Duelist', 'Raze': 'Duelist', 'Reyna': 'Duelist', 'Yoru': 'Duelist', 'Phoenix': 'Duelist', 'Iso': 'Duelist', 'Waylay': 'Duelist', 'Neon':'Duelist',
-            'Skye': 'Initiator', 'KAY/O': 'Initiator', 'Breach': 'Initiator', 'Fade': 'Initiator', 'Sova': 'Initiator', 'Gekko': 'Initiator', 'Tejo': 'Initiator',
-            'Omen': 'Controller', 'Brimstone': 'Controller', 'Astra': 'Controller', 'Viper': 'Controller', 'Harbor': 'Controller', 'Clove': 'Controller',
-            'Killjoy': 'Sentinel', 'Cypher': 'Sentinel', 'Chamber': 'Sentinel', 'Sage': 'Sentinel', 'Deadlock': 'Sentinel', 'Vyse': 'Sentinel'
-        }
-
-        # VCT average benchmarks by role
-        vct_benchmarks = {
-            'Duelist':     {'ACS': 240, 'KPR': 0.90, 'FBSR': 0.55, 'FKPR': 0.18, 'Atk_Entry': 0.55},
-            'Initiator':   {'ACS': 196, 'KPR': 0.90, 'FD': 2, 'K+A per Round': 1, 'Assists': 10.0},
-            'Controller':  {'ACS': 203, 'KPR': 0.90, 'FD': 2, 'K+A per Round': 1, 'Multi_Kills': 0.25},
-            'Sentinel':    {'ACS': 200, 'KPR': 0.90, 'FD': 2, 'Multi_Kills': 0.25, 'Anchor_Time': 48.0},
-        }
-
-        filtered = player_df[
-            (player_df['Player'] == selected_player) &
-            (player_df['Date'].dt.date >= start_date) &
-            (player_df['Date'].dt.date <= end_date)
-        ]
-
-        if selected_map != "All":
-            filtered = filtered[filtered['Column 1'] == selected_map]
-
-        if not filtered.empty:
-            # Fill missing 'Atk Entry' with 0 to ensure smooth calculations
-            if 'Atk_Entry' in filtered.columns:
-                filtered['Atk_Entry'] = filtered['Atk_Entry'].fillna(0)
-
-            # Clean and convert percentage columns
-            for col in ['Rounds', 'Kills', 'Deaths', 'Assists', 'ACS', 'FK', 'FBSR', 'FKPR', 'KPR', 'Atk_Entry', 'FD','Multi-Kills']:
-                if col in filtered.columns:
-                    filtered[col] = filtered[col].astype(str).str.replace('%', '', regex=False)
-                    filtered[col] = pd.to_numeric(filtered[col], errors='coerce')
-
-            # Compute player stats per agent
-            agent_stats = filtered.groupby('Agent').agg(
-                Rounds=('Rounds', 'sum'),
-                Kills=('Kills', 'sum'),
-                Deaths=('Deaths', 'sum'),
-                Multi_Kills=('Multi_Kills','mean'),
-                Assists=('Assists', 'mean'),
-                ACS=('ACS', 'mean'),
-                FK=('FK', 'sum'),
-                FBSR=('FBSR', 'mean'),
-                FKPR=('FKPR', 'mean'),
-                KPR=('KPR', 'mean'),
-                Atk_Entry=('Atk_Entry', 'mean'),
-                FD=('FD', 'mean'),
-                Anchor_Time=('Anchor_Time', 'mean')
-            ).reset_index()
-
-            agent_stats['K/D Ratio'] = agent_stats['Kills'] / agent_stats['Deaths'].replace(0, float('nan'))
-            agent_stats['K+A per Round'] = (agent_stats['Kills'] + agent_stats['Assists']) / agent_stats['Rounds'].replace(0, float('nan'))
-            agent_stats['Role'] = agent_stats['Agent'].map(agent_roles)
-
-            selected_role = st.selectbox("Select Role:", sorted(vct_benchmarks.keys()), key='compare_role')
-            role_agents = agent_stats[agent_stats['Role'] == selected_role]
-
-            if not role_agents.empty:
-                benchmark = vct_benchmarks[selected_role]
-
-                player_avg = {}
-                for stat in benchmark:
-                    if stat == 'FK':
-                        player_avg[stat] = (role_agents['FK'].sum() / role_agents['Rounds'].sum()) if role_agents['Rounds'].sum() > 0 else 0
-                    elif stat == 'K+A per Round':
-                        player_avg[stat] = (role_agents['Kills'].sum() + role_agents['Assists'].sum()) / role_agents['Rounds'].sum()
-                    elif stat == 'K/D Ratio':
-                        player_avg[stat] = role_agents['Kills'].sum() / role_agents['Deaths'].replace(0, float('nan')).sum()
-                    else:
-                        if stat in role_agents.columns:
-                            val = role_agents[stat].mean()
-                            player_avg[stat] = val if pd.notna(val) else 0
-                        else:
-                            player_avg[stat] = 0
-
-                # Normalize values (manual bounds)
-                norm_base = {
-                    'ACS': 300,
-                    'K/D Ratio': 2.0,
-                    'FK': 0.3,
-                    'K+A per Round': 1.2,
-                    'KPR': 1.2,
-                    'FBSR': 1.0,
-                    'FKPR': 0.3,
-                    'Atk_Entry': 1.0,
-                    'FD': 20.0,
-                    'Assists': 20.0,
-                    'Multi_Kills': 0.3,
-                    'Anchor_Time':80.0
-                }
-
-                categories = list(benchmark.keys())
-                player_values = [player_avg.get(stat, 0) / norm_base[stat] for stat in categories]
-                benchmark_values = [benchmark.get(stat, 0) / norm_base[stat] for stat in categories]
-
-                import plotly.graph_objects as go
-                fig = go.Figure()
-                fig.add_trace(go.Scatterpolar(
-                    r=player_values,
-                    theta=categories,
-                    fill='toself',
-                    name=f"{selected_player}",
-                    line=dict(color="#DC143C")
-                ))
-                fig.add_trace(go.Scatterpolar(
-                    r=benchmark_values,
-                    theta=categories,
-                    fill='toself',
-                    name=f"VCT {selected_role} Avg",
-                    line=dict(color="#444444")
-                ))
-
-                raw_values = []
-                for stat in categories:
-                    val = player_avg[stat]
-                    bmark = benchmark[stat]
-                    diff = val - bmark
-                    sign = '+' if diff >= 0 else ''
-                    color = "#14532d" if diff >= 0 else "#7f1d1d"
-
-                    # Use % format for relevant stats
-                    if stat in ['FBSR', 'FKPR', 'Atk Entry']:
-                        display_diff = f"{sign}{diff * 100:.1f}%"
-                    else:
-                        display_diff = f"{sign}{diff:.2f}"
-
-                    if stat in ['FBSR', 'FKPR', 'Atk Entry']:
-                        raw_values.append(f"<span style='color:{color}'><b>{stat}</b>: {sign}{diff * 100:.1f}%</span>")
-                    else:
-                        raw_values.append(f"<span style='color:{color}'><b>{stat}</b>: {sign}{diff:.2f}</span>")
-
-                fig.add_annotation(
-                    text="<br>".join(raw_values),
-                    showarrow=False,
-                    align="left",
-                    x=0.95,
-                    y=0.95,
-                    xref="paper",
-                    yref="paper",
-                    bordercolor="#666",
-                    borderwidth=1,
-                    bgcolor="rgba(0,0,0,0.85)",
-                    font=dict(color="white", size=12)
-                )
-
-                fig.update_layout(
-                    polar=dict(
-                        bgcolor="#000000",
-                        radialaxis=dict(
-                            visible=False,
-                            showticklabels=False,
-                            ticks='',
-                            showline=False,
-                            gridcolor="#333333"
-                        ),
-                        angularaxis=dict(tickfont=dict(color="#DC143C"))
-                    ),
-                    showlegend=True,
-                    legend=dict(font=dict(color="#ffffff")),
-                    plot_bgcolor='#000000',
-                    paper_bgcolor='#000000',
-                    font=dict(family='Inter', color='#DC143C'),
-                    title=dict(text=f"{selected_role} Stats vs VCT Benchmark", font=dict(size=16, color='#DC143C')),
-                    margin=dict(l=40, r=40, t=60, b=40)
-                )
-                st.plotly_chart(fig, use_container_width=True)
+        selected_player = col1.selectbox(
+            "Select a player:", all_players, key=remember('compare_player', all_players[0], all_players))
+        start_date = col1.date_input("Start date:", min_value=min_date, max_value=max_date,
+                                     key=remember('compare_start', min_date, bounds=(min_date, max_date)))
+        end_date = col2.date_input("End date:", min_value=min_date, max_value=max_date,
+                                   key=remember('compare_end', max_date, bounds=(min_date, max_date)))
+        selected_map = col2.selectbox("Filter by Map:", ["All"] + all_maps, key=remember('compare_map', "All", ["All"] + all_maps))
+
+        agent_stats = cached_player_role_stats(form_version(start_date, end_date), selected_player, start_date, end_date, selected_map)
+
+        if not agent_stats.empty:
+            roles = sorted(analytics.VCT_BENCHMARKS)
+            selected_role = st.selectbox("Select Role:", roles, key=remember('compare_role', roles[0], roles))
+            radar = cached_radar_inputs(form_version(start_date, end_date), selected_player, start_date, end_date, selected_map, selected_role)
+
+            if radar is not None:
+                with timings.timed("figure.radar"):
+                    fig = figures.radar(radar, selected_player, selected_role)
+                with timings.timed("emit.plotly_chart"):
+                    st.plotly_chart(fig, use_container_width=True)
 
             else:
                 st.info("No agents played in the selected role during this period.")
@@ -1245,6 +725,39 @@ with tabs[5]:
     else:
         st.warning("No player stats found in form.csv")
 
+SECTIONS = {
+    "📊 Overview": render_overview,
+    "🧩 Map Composition Win Rates": render_map_compositions,
+    "📈 Round Insights": render_round_insights,
+    "🔫 Pistol Insights": render_pistol_insights,
+    "🔢 Player Stats": render_player_stats,
+    "🆚 Player Comparison": render_player_comparison,
+}
+section = st.radio("Section", list(SECTIONS), horizontal=True, label_visibility="collapsed", key="section")
+with timings.timed("section"):
+    SECTIONS[section]()
+
+# 🧮 Memory: the cached datasets exist once per process; a session only adds the
+# frames it filtered or converted itself
+session_frames = [form_df, score_df, acs_df] + [v for v in st.session_state.values() if isinstance(v, pd.DataFrame)]
+with st.sidebar.expander("🧮 Memory"):
+    st.caption(f"Shared datasets (all sessions): {shared_bytes() / 2**20:.1f} MB")
+    st.caption(f"This session: {sum(map(private_bytes, session_frames)) / 2**20:.2f} MB")
+
+# ⏱️ Timings (admins): this rerun's timers and p50 / p95 over the last
+# RECENT_RERUNS reruns per section; fragment reruns record themselves
+record_timings(timings.finish(section))
+if is_admin:
+    with st.sidebar.expander("⏱️ Timings"):
+        st.toggle("Time reruns", key='show_timings')
+        recent = st.session_state.get('timing_history', [])
+        if recent:
+            last = recent[-1]
+            st.caption(f"Last rerun ({last['section']}): {last['timers']['total'] * 1000:.0f} ms")
+            st.dataframe(timings.percentiles(recent), hide_index=True, use_container_width=True)
+            if os.environ.get(timings.LOG_ENV):
+                st.caption(f"Logging to {os.environ[timings.LOG_ENV]}")
+
 # Footer in bottom-right corner
 # Full-width footer pinned to bottom
 st.markdown("""
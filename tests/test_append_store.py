@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+from data_cleaner import append_store, normalise_types, store_path, write_store  # noqa: E402
+from synthetic import synthetic_score  # noqa: E402
+
+
+def _batches(tmp_path):
+    score = synthetic_score(30)
+    # Post-plant success all at or below 1%: the store holds 0.5, not 50
+    score['Atk_PP_Success'] = [f"{0.1 * (i % 11):.2f}%" for i in range(len(score))]
+    csv_path = str(tmp_path / 'cleaned_score.csv')
+    return csv_path, score.iloc[:10], score.iloc[10:20], score.iloc[20:]
+
+
+def test_append_twice_leaves_stored_values_unchanged(tmp_path):
+    csv_path, first, second, third = _batches(tmp_path)
+    first.to_csv(csv_path, index=False)
+    write_store(pd.read_csv(csv_path), csv_path)
+    stored = pd.read_parquet(store_path(csv_path))
+
+    append_store(second, csv_path)
+    append_store(third, csv_path)
+    combined = pd.read_parquet(store_path(csv_path))
+
+    # Categories may grow with new teams; the values must not change
+    pd.testing.assert_frame_equal(combined.iloc[:len(stored)], stored, check_dtype=False, check_categorical=False)
+    expected = normalise_types(pd.concat([first, second, third], ignore_index=True))
+    pd.testing.assert_frame_equal(combined, expected)
+    assert combined['Atk_PP_Success'].max() <= 1
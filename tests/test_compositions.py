@@ -0,0 +1,73 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import compositions  # noqa: E402
+from compositions import CompositionIndex, shared_composition_index  # noqa: E402
+from synthetic import synthetic_form, synthetic_score  # noqa: E402
+
+build = CompositionIndex.build
+
+
+@pytest.fixture
+def data():
+    form = synthetic_form(1000)
+    form['Date'] = pd.to_datetime(form['Date'], format='%m/%d/%Y')
+    return form, synthetic_score(200)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    # Records every CompositionIndex.build call, starting from an empty shared index
+    monkeypatch.setattr(compositions, '_shared_index', {})
+    calls = []
+    monkeypatch.setattr(CompositionIndex, 'build', classmethod(lambda cls, *args: calls.append(args) or build(*args)))
+    return calls
+
+
+def assert_same_tables(index, expected, start=None, end=None):
+    assert index.maps() == expected.maps()
+    for map_name in expected.maps():
+        pd.testing.assert_frame_equal(index.table(map_name, start, end, top=1000),
+                                      expected.table(map_name, start, end, top=1000))
+
+
+def test_extend_matches_build(data):
+    form, score = data
+    index = build(form.iloc[:500], score)
+    # Not a whole number of blocks: the partial block waits for the rest
+    index.extend(form.iloc[:733])
+    index.extend(form)
+    assert index.rows_seen == len(form)
+    expected = build(form, score)
+    assert_same_tables(index, expected)
+    assert_same_tables(index, expected, '2025-01-10', '2025-01-20')
+
+
+def test_append_extends_a_copy_of_the_shared_index(data, builds):
+    form, score = data
+    before = shared_composition_index(form.iloc[:500], score, 1, 1)
+    after = shared_composition_index(form, score, 2, 1)
+
+    assert len(builds) == 1
+    assert after is not before and before.rows_seen == 500
+    assert_same_tables(before, build(form.iloc[:500], score))
+    assert_same_tables(after, build(form, score))
+
+
+def test_edit_to_a_middle_row_rebuilds(data, builds):
+    form, score = data
+    shared_composition_index(form, score, 1, 1)
+    edited = form.copy()
+    edited.loc[502, 'Agent'] = next(a for a in sorted(set(form['Agent'])) if a != form.loc[502, 'Agent'])
+    edited = pd.concat([edited, form.iloc[:5]], ignore_index=True)
+
+    index = shared_composition_index(edited, score, 2, 1)
+
+    assert len(builds) == 2
+    assert_same_tables(index, build(edited, score))
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from data_cleaner import normalise_types, validate  # noqa: E402
+
+
+def test_units_come_from_the_schema():
+    raw = pd.DataFrame({
+        'First Half WR': ['43%', '0.43', '1'],        # ratio
+        'Atk_PP_Success': ['43%', '43', '0.5'],       # percent
+    })
+    typed = normalise_types(raw)
+    assert typed['First Half WR'].tolist() == pytest.approx([0.43, 0.43, 1.0])
+    assert typed['Atk_PP_Success'].tolist() == pytest.approx([43.0, 43.0, 0.5])
+
+
+def test_batches_convert_the_same_way():
+    # A batch whose bare percent values are all <= 1 is not rescaled
+    first = pd.DataFrame({'Atk_PP_Success': [0.5, 1.0], 'Def_PP_Success': ['0.5', '1']})
+    second = pd.DataFrame({'Atk_PP_Success': [40.0, 80.0], 'Def_PP_Success': ['40', '80%']})
+    together = normalise_types(pd.concat([first, second], ignore_index=True))
+    separately = pd.concat([normalise_types(first), normalise_types(second)], ignore_index=True)
+    pd.testing.assert_frame_equal(together, separately)
+    assert together['Atk_PP_Success'].tolist() == [0.5, 1.0, 40.0, 80.0]
+
+
+def test_ratio_written_as_percent_is_flagged():
+    typed = normalise_types(pd.DataFrame({'Second Half WR': [0.5, 43, 0.6]}))
+    assert validate(typed) == {'Second Half WR': 1}
+
@@ -0,0 +1,85 @@
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import analytics  # noqa: E402
+import rollups  # noqa: E402
+from data_cleaner import normalise_types  # noqa: E402
+from synthetic import synthetic_form, synthetic_score  # noqa: E402
+
+# Whole dataset, a range starting and ending mid-dataset, and one past its end
+RANGES = [(None, None), ('2025-01-05', '2025-01-12'), (date(2025, 1, 20), date(2025, 6, 1))]
+
+
+@pytest.fixture(scope='module')
+def score_df():
+    score = synthetic_score(400)
+    # Rows whose date didn't parse: left out of date ranges, still in whole-dataset totals
+    score.loc[[3, 150, 151], 'Date'] = 'not a date'
+    return normalise_types(score)
+
+
+@pytest.fixture(scope='module')
+def form_df():
+    form = synthetic_form(2000)
+    form.loc[[7, 900, 901], 'Date'] = 'not a date'
+    return normalise_types(form)
+
+
+def assert_same(rolled, raw, keys):
+    assert set(rolled.columns) == set(raw.columns)
+    rolled, raw = (
+        df[raw.columns].astype({k: str for k in keys}).sort_values(keys, ignore_index=True)
+        for df in (rolled, raw)
+    )
+    pd.testing.assert_frame_equal(rolled, raw, check_dtype=False, check_categorical=False, rtol=1e-5)
+
+
+def test_nat_rows_are_kept(score_df, form_df):
+    assert score_df['Date'].isna().sum() == 3 and form_df['Date'].isna().sum() == 3
+    assert rollups.score_rollup(score_df)['Matches'].sum() == len(score_df)
+    assert rollups.form_rollup(form_df)['Rows'].sum() == len(form_df)
+
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_score_summaries(score_df, start, end):
+    cube = rollups.score_rollup(score_df)
+    rows = analytics.filter_rows(score_df, start, end)
+    assert_same(rollups.map_summary(cube, start, end), analytics.map_summary(score_df, start, end), ['Map'])
+    assert_same(rollups.round_summary(cube, start, end), analytics.round_summary(rows), ['Map'])
+    assert_same(rollups.round_summary(cube, start, end, 'Bind'),
+                analytics.round_summary(analytics.filter_rows(score_df, start, end, 'Bind')), ['Map'])
+    assert_same(rollups.pistol_rates(cube, start, end), analytics.pistol_rates(rows), ['Map'])
+    for rolled, raw in zip(rollups.second_round_conversions(cube, start, end, 'Bind'),
+                           analytics.second_round_conversions(rows, 'Bind')):
+        assert_same(rolled, raw, ['Conversion'])
+
+
+def test_post_plant(score_df):
+    cube = rollups.score_rollup(score_df)
+    assert_same(rollups.post_plant_table(cube), analytics.post_plant_table(score_df), ['Map'])
+
+
+@pytest.mark.parametrize('start, end', RANGES)
+@pytest.mark.parametrize('map_name', ['All', 'Haven'])
+def test_player_summaries(form_df, start, end, map_name):
+    cube = rollups.form_rollup(form_df)
+    for player in ['Erv', 'sub2']:
+        assert_same(rollups.player_agent_stats(cube, player, start, end, map_name),
+                    analytics.player_agent_stats(form_df, player, start, end, map_name), ['Agent'])
+        assert_same(rollups.player_role_stats(cube, player, start, end, map_name),
+                    analytics.player_role_stats(form_df, player, start, end, map_name), ['Agent'])
+
+
+def test_merged_rollup_matches_full_rollup(score_df):
+    # An append that shares a day with the existing rows
+    merged = rollups.merge_rollups(rollups.score_rollup(score_df.iloc[:200]), rollups.score_rollup(score_df.iloc[200:]))
+    start, end = RANGES[1]
+    assert_same(rollups.map_summary(merged, start, end), analytics.map_summary(score_df, start, end), ['Map'])
+    assert_same(rollups.map_summary(merged, None, None), analytics.map_summary(score_df, None, None), ['Map'])
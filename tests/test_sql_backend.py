@@ -0,0 +1,78 @@
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import analytics  # noqa: E402
+import sql_backend  # noqa: E402
+from data_cleaner import normalise_types, write_store  # noqa: E402
+from synthetic import synthetic_form, synthetic_score  # noqa: E402
+
+# Quotes in names go through _where's parameters, never into the SQL text
+MAP = 'Bind\'s "B" site'
+PLAYER = "o'neil"
+RANGES = [(None, None), ('2025-01-05', '2025-01-12'), (date(2025, 1, 20), date(2025, 6, 1))]
+
+
+@pytest.fixture(scope='module')
+def data(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('sql')
+    db_path = str(directory / 'scrims.db')
+    score = synthetic_score(400).replace({'Map': {'Bind': MAP}})
+    score.loc[[3, 150], 'Date'] = 'not a date'
+    form = synthetic_form(2000).replace({'Column 1': {'Bind': MAP}, 'Player': {'Erv': PLAYER}})
+    form.loc[[7, 900], 'Date'] = 'not a date'
+    write_store(score, str(directory / 'cleaned_score.csv'), db_path)
+    write_store(form, str(directory / 'form.csv'), db_path)
+    return db_path, normalise_types(score), normalise_types(form)
+
+
+def assert_same(queried, raw, keys):
+    assert list(queried.columns) == list(raw.columns)
+    queried, raw = (df.astype({k: str for k in keys}).sort_values(keys, ignore_index=True) for df in (queried, raw))
+    pd.testing.assert_frame_equal(queried, raw, check_dtype=False, check_categorical=False, rtol=1e-5)
+
+
+@pytest.mark.parametrize('start, end', RANGES)
+@pytest.mark.parametrize('map_name', ['All', MAP])
+def test_score_queries(data, start, end, map_name):
+    db_path, score_df, _ = data
+    rows = analytics.filter_rows(score_df, start, end, map_name)
+    queried = sql_backend.score_rows(db_path, start, end, map_name)
+    pd.testing.assert_series_equal(queried['Date'], rows['Date'].reset_index(drop=True), check_dtype=False)
+
+    assert_same(sql_backend.round_summary(db_path, start, end, map_name), analytics.round_summary(rows), ['Map'])
+    for queried_pie, raw_pie in zip(sql_backend.second_round_conversions(db_path, start, end, MAP),
+                                    analytics.second_round_conversions(rows, MAP)):
+        assert_same(queried_pie, raw_pie, ['Conversion'])
+
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_map_queries(data, start, end):
+    db_path, score_df, _ = data
+    rows = analytics.filter_rows(score_df, start, end)
+    assert_same(sql_backend.map_summary(db_path, start, end), analytics.map_summary(score_df, start, end), ['Map'])
+    assert_same(sql_backend.pistol_rates(db_path, start, end), analytics.pistol_rates(rows), ['Map'])
+    assert MAP in set(sql_backend.map_summary(db_path, start, end)['Map'])
+
+
+def test_post_plant(data):
+    db_path, score_df, _ = data
+    assert_same(sql_backend.post_plant_table(db_path), analytics.post_plant_table(score_df), ['Map'])
+
+
+@pytest.mark.parametrize('start, end', RANGES)
+@pytest.mark.parametrize('map_name', ['All', MAP])
+def test_player_queries(data, start, end, map_name):
+    db_path, _, form_df = data
+    for player in [PLAYER, 'sub2']:
+        queried = sql_backend.player_agent_stats(db_path, player, start, end, map_name)
+        assert not queried.empty
+        assert_same(queried, analytics.player_agent_stats(form_df, player, start, end, map_name), ['Agent'])
+        assert_same(sql_backend.player_role_stats(db_path, player, start, end, map_name),
+                    analytics.player_role_stats(form_df, player, start, end, map_name), ['Agent'])
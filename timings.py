@@ -0,0 +1,110 @@
+import argparse
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# Opt-in hot-path timers for the dashboard. Each Streamlit session runs its
+# script on its own thread, so the rerun being timed is thread-local; with no
+# rerun started every timer is a no-op.
+# One JSON line per rerun is appended here when $SCRIM_TIMINGS_LOG is set
+LOG_ENV = "SCRIM_TIMINGS_LOG"
+# Reruns kept per session for the p50 / p95 columns
+RECENT_RERUNS = 50
+
+_local = threading.local()
+
+
+def start():
+    """
+    Begins timing a rerun on this thread, dropping any unfinished one.
+    """
+    _local.timers = {}
+    _local.started = time.perf_counter()
+
+
+def active():
+    return getattr(_local, 'timers', None) is not None
+
+
+def clock():
+    """
+    Start time for record(), or None when no rerun is being timed.
+    """
+    return time.perf_counter() if active() else None
+
+
+def record(name, since):
+    # Repeated names within one rerun add up
+    if since is not None and active():
+        _local.timers[name] = _local.timers.get(name, 0.0) + time.perf_counter() - since
+
+
+@contextmanager
+def timed(name):
+    since = clock()
+    try:
+        yield
+    finally:
+        record(name, since)
+
+
+def finish(section):
+    """
+    Ends the rerun and returns its record: timestamp, section, total and
+    per-timer seconds. None if no rerun was being timed.
+    """
+    if not active():
+        return None
+    timers, total = _local.timers, time.perf_counter() - _local.started
+    _local.timers = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'section': section,
+        'timers': {'total': total, **timers},
+    }
+
+
+def percentiles(records):
+    """
+    Runs / last / p50 / p95 (ms) per section and timer over `records`.
+    """
+    rows = [
+        {'section': rec['section'], 'timer': name, 'ms': seconds * 1000}
+        for rec in records for name, seconds in rec['timers'].items()
+    ]
+    if not rows:
+        return pd.DataFrame(columns=['section', 'timer', 'runs', 'last', 'p50', 'p95'])
+    grouped = pd.DataFrame(rows).groupby(['section', 'timer'], sort=False)['ms']
+    return pd.DataFrame({
+        'runs': grouped.size(),
+        'last': grouped.last(),
+        'p50': grouped.quantile(0.5),
+        'p95': grouped.quantile(0.95),
+    }).round(1).reset_index()
+
+
+def append_log(path, rec):
+    with open(path, 'a') as f:
+        f.write(json.dumps(rec) + '\n')
+
+
+def read_log(path, last=None):
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return records[-last:] if last else records
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Per-section p50 / p95 from a dashboard timings log")
+    arg_parser.add_argument('log', help=f"file the dashboard wrote with ${LOG_ENV} set")
+    arg_parser.add_argument('-n', '--last', type=int, default=RECENT_RERUNS, help="reruns to include (0: all)")
+    args = arg_parser.parse_args(argv)
+    print(percentiles(read_log(args.log, args.last)).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()